@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import importlib
+from typing import Any
+
+from app.plugins.base import AIPlugin
+
+
+def make_plugin(name: str, tasks: list[str]) -> type[AIPlugin]:
+    """
+    Build the lazy wrapper class used by the generated app/plugins/<name>/plugin.py files.
+
+    The wrapper delegates to app.services.<name>.service.Plugin, importing it on first use.
+
+    Args:
+        name (str): Service/plugin name.
+        tasks (list[str]): Tasks known at generation time (may be empty).
+
+    Returns:
+        type[AIPlugin]: A Plugin class bound to the given service.
+    """
+    service_module = f"app.services.{name}.service"
+    default_tasks = list(tasks)
+
+    class Plugin(AIPlugin):
+        provider = "local"
+        _impl = None  # instance of app.services.<name>.service.Plugin
+
+        def __init__(self) -> None:
+            self.name = name
+            self.tasks = list(default_tasks)
+
+        def load(self) -> None:
+            if self._impl is None:
+                mod = importlib.import_module(service_module)
+                Impl = mod.Plugin
+                self._impl = Impl()
+                if hasattr(self._impl, "load"):
+                    self._impl.load()
+            if not self.tasks and self._impl is not None:
+                svc_tasks = getattr(self._impl, "tasks", [])
+                if isinstance(svc_tasks, (list, tuple, set)):
+                    self.tasks = list(svc_tasks)
+
+        def infer(self, payload: dict[str, Any]) -> Any:
+            # generic fallback: dispatch by 'task' field
+            self.load()
+            task = (payload or {}).get("task")
+            if isinstance(task, str) and hasattr(self._impl, task):
+                return getattr(self._impl, task)(payload)
+            raise AttributeError(f"Unknown task: {task!r}")
+
+        def __getattr__(self, item: str):
+            # ensure tasks are populated before checking
+            self.load()
+            if item in self.tasks and hasattr(self._impl, item):
+
+                def _call(payload: dict[str, Any]):
+                    self.load()
+                    return getattr(self._impl, item)(payload)
+
+                return _call
+            raise AttributeError(item)
+
+    Plugin.name = name
+    Plugin.tasks = list(default_tasks)
+    return Plugin
@@ -1,12 +1,32 @@
 from __future__ import annotations
 
+import hashlib
 import json
+import os
+import pickle
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import pydantic
 from pydantic import BaseModel, field_validator
 
 
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:  # optional speedup; stdlib json also accepts bytes
+    _loads = json.loads
+
 WORKFLOWS_ROOT = Path(__file__).resolve().parent  # app/workflows
+# On-disk cache of parsed workflows, keyed by (path, mtime, size) of the JSON files.
+# Entries are pickles and pickle.load() can run arbitrary code: the directory must only be
+# writable by the user running the server (it is created 0700). Point WORKFLOWS_CACHE_DIR
+# elsewhere if the default location is shared.
+CACHE_DIR = Path(os.getenv("WORKFLOWS_CACHE_DIR") or Path.home() / ".cache" / "repo-server")
+# Bump when WorkflowManifest/WorkflowSpec change in a way their field names do not reveal.
+_CACHE_SCHEMA = 1
+_LOAD_WORKERS = 8
 
 
 class WorkflowManifest(BaseModel):
@@ -33,21 +53,104 @@ _REGISTRY: dict[str, WorkflowSpec] = {}
 _LOADED = False
 
 
+def _manifest_paths(root: Path) -> list[Path]:
+    """Return <root>/<dir>/manifest.json for each direct child dir (single scandir, no glob walk)."""
+    with os.scandir(root) as it:
+        dirs = sorted(e.path for e in it if e.is_dir(follow_symlinks=False))
+    return [Path(d, "manifest.json") for d in dirs if os.path.isfile(os.path.join(d, "manifest.json"))]
+
+
+def _stat_sig(path: Path) -> tuple[str, int, int]:
+    st = path.stat()
+    return (str(path), st.st_mtime_ns, st.st_size)
+
+
+def _cache_prefix(root: Path) -> str:
+    return "workflows-" + hashlib.sha1(str(root.resolve()).encode("utf-8")).hexdigest()[:8]
+
+
+def _cache_file(root: Path, manifests: list[Path]) -> Path:
+    """
+    Cache path derived from the root, the model schema and the stat signature of every manifest.
+    Sequence files can live anywhere (manifest.sequence_file), so they are checked on read instead.
+    """
+    sig = [
+        str(root.resolve()),
+        f"schema:{_CACHE_SCHEMA}:pydantic-{pydantic.VERSION}",
+        ",".join(WorkflowManifest.model_fields),
+        ",".join(WorkflowSpec.model_fields),
+    ]
+    sig.extend("{}:{}:{}".format(*_stat_sig(m)) for m in manifests)
+    digest = hashlib.sha1("\n".join(sig).encode("utf-8")).hexdigest()[:16]
+    return CACHE_DIR / f"{_cache_prefix(root)}-{digest}.pkl"
+
+
+def _read_cache(path: Path) -> dict[str, WorkflowSpec] | None:
+    """Cached specs, or None if missing/unreadable or any sequence file changed since it was written."""
+    try:
+        with path.open("rb") as f:
+            data = pickle.load(f)  # trusted: CACHE_DIR is private to this user (see above)
+        if not isinstance(data, dict):
+            return None
+        for dep in data["deps"]:
+            if _stat_sig(Path(dep[0])) != tuple(dep):
+                return None
+        specs = data["specs"]
+        return specs if isinstance(specs, dict) else None
+    except Exception:
+        return None
+
+
+def _write_cache(path: Path, data: dict[str, WorkflowSpec], deps: list[tuple[str, int, int]]) -> None:
+    """Write the cache atomically, then drop older cache files for the same root."""
+    try:
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with tmp.open("wb") as f:
+            pickle.dump({"deps": deps, "specs": data}, f, protocol=5)
+        os.replace(tmp, path)
+        prefix = path.name.rsplit("-", 1)[0]
+        for old in path.parent.glob(f"{prefix}-*.pkl"):
+            if old != path:
+                old.unlink(missing_ok=True)
+    except Exception:
+        pass  # cache is best-effort
+
+
+def _load_one(m: Path) -> tuple[WorkflowSpec, Path]:
+    """Parse one workflow; also return its sequence file so the cache can track it."""
+    # read each file once, as bytes (no decode step)
+    raw = m.read_bytes()
+    try:
+        manifest = WorkflowManifest.model_validate_json(raw)
+    except Exception:
+        manifest = WorkflowManifest.model_validate(_loads(raw))
+    seq_path = m.parent / manifest.sequence_file
+    sequence = _loads(seq_path.read_bytes())
+    return WorkflowSpec(manifest=manifest, sequence=sequence), seq_path
+
+
 def load_all(root: Path | None = None) -> None:
     global _LOADED
     if root is None:
         root = WORKFLOWS_ROOT
     _REGISTRY.clear()
 
-    for m in root.glob("*/manifest.json"):
-        try:
-            manifest = WorkflowManifest.model_validate_json(m.read_text(encoding="utf-8"))
-        except Exception:
-            manifest = WorkflowManifest.model_validate(json.loads(m.read_text(encoding="utf-8")))
-        wf_dir = m.parent
-        seq_path = wf_dir / manifest.sequence_file
-        sequence = json.loads(seq_path.read_text(encoding="utf-8"))
-        _REGISTRY[manifest.name] = WorkflowSpec(manifest=manifest, sequence=sequence)
+    manifests = _manifest_paths(root)
+    cache_path = _cache_file(root, manifests)
+    cached = _read_cache(cache_path)
+    if cached is not None:
+        _REGISTRY.update(cached)
+        _LOADED = True
+        return
+
+    # independent read+parse per workflow; map() keeps registration order deterministic
+    deps = []
+    with ThreadPoolExecutor(max_workers=_LOAD_WORKERS) as ex:
+        for spec, seq_path in ex.map(_load_one, manifests):
+            _REGISTRY[spec.manifest.name] = spec
+            deps.append(_stat_sig(seq_path))
+    _write_cache(cache_path, _REGISTRY, deps)
     _LOADED = True
 
 
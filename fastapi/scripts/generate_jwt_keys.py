@@ -22,11 +22,13 @@ def ensure_dir(p: Path) -> None:
 
 
 def save(path: Path, data: bytes) -> None:
-    path.write_bytes(data)
-    try:
-        os.chmod(path, 0o600)
-    except Exception:
-        pass
+    # Create the file with 0600 in the open() call itself (no window with default perms)
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    fd = os.open(path, flags, 0o600)
+    if hasattr(os, "fchmod"):
+        os.fchmod(fd, 0o600)  # O_CREAT mode only applies to new files
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
 
 
 def gen_hs256(secret_len: int = 64) -> str:
@@ -34,8 +36,7 @@ def gen_hs256(secret_len: int = 64) -> str:
     return secrets.token_urlsafe(secret_len)
 
 
-def gen_rs256(private_path: Path, public_path: Path, key_size: int = 2048) -> None:
-    private_key = rsa.generate_private_key(public_exponent=65537, key_size=key_size, backend=default_backend())
+def _pem_pair(private_key) -> tuple[bytes, bytes]:
     priv_pem = private_key.private_bytes(
         serialization.Encoding.PEM,
         serialization.PrivateFormat.PKCS8,
@@ -46,24 +47,32 @@ def gen_rs256(private_path: Path, public_path: Path, key_size: int = 2048) -> No
         serialization.Encoding.PEM,
         serialization.PublicFormat.SubjectPublicKeyInfo,
     )
-    save(private_path, priv_pem)
-    save(public_path, pub_pem)
+    return priv_pem, pub_pem
 
 
-def gen_es256(private_path: Path, public_path: Path) -> None:
+def rs256_pem(key_size: int = 2048) -> tuple[bytes, bytes]:
+    """Return (private_pem, public_pem) for a new RSA keypair."""
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=key_size, backend=default_backend())
+    return _pem_pair(private_key)
+
+
+def es256_pem() -> tuple[bytes, bytes]:
+    """Return (private_pem, public_pem) for a new P-256 keypair."""
     private_key = ec.generate_private_key(ec.SECP256R1(), backend=default_backend())  # P-256
-    priv_pem = private_key.private_bytes(
-        serialization.Encoding.PEM,
-        serialization.PrivateFormat.PKCS8,
-        serialization.NoEncryption(),
-    )
-    public_key = private_key.public_key()
-    pub_pem = public_key.public_bytes(
-        serialization.Encoding.PEM,
-        serialization.PublicFormat.SubjectPublicKeyInfo,
-    )
-    save(private_path, priv_pem)
-    save(public_path, pub_pem)
+    return _pem_pair(private_key)
+
+
+def save_pair(private_path: Path, public_path: Path, pems: tuple[bytes, bytes]) -> None:
+    save(private_path, pems[0])
+    save(public_path, pems[1])
+
+
+def gen_rs256(private_path: Path, public_path: Path, key_size: int = 2048) -> None:
+    save_pair(private_path, public_path, rs256_pem(key_size))
+
+
+def gen_es256(private_path: Path, public_path: Path) -> None:
+    save_pair(private_path, public_path, es256_pem())
 
 
 def main() -> None:
@@ -85,6 +94,9 @@ def main() -> None:
 
     print(f"Output directory: {out_dir.resolve()}")
 
+    want_rs = args.rs or args.all
+    want_es = args.es or args.all
+
     if args.hs or args.all:
         secret = gen_hs256()
         hs_env = [
@@ -95,7 +107,7 @@ def main() -> None:
         print("\n# Add to .env (HS256):")
         print("\n".join(hs_env))
 
-    if args.rs or args.all:
+    if want_rs:
         priv = out_dir / "jwt_rsa_private.pem"
         pub = out_dir / "jwt_rsa_public.pem"
         gen_rs256(priv, pub)
@@ -108,7 +120,7 @@ def main() -> None:
         print("\n# Add to .env (RS256):")
         print("\n".join(rs_env))
 
-    if args.es or args.all:
+    if want_es:
         priv = out_dir / "jwt_ec_private.pem"
         pub = out_dir / "jwt_ec_public.pem"
         gen_es256(priv, pub)
@@ -6,6 +6,7 @@ Cross-platform PyTorch installer:
 - Fallback -> CPU
 Usage:
   py -m scripts.install_torch --gpu | --cpu | --rocm
+  py -m scripts.install_torch --verify    # also import torch and print CUDA/MPS availability
 Env:
   DEVICE=cuda:0 -> prefer GPU
   DEVICE=cpu    -> force CPU
@@ -14,6 +15,7 @@ Env:
 from __future__ import annotations
 
 import argparse
+import importlib.metadata
 import os
 import platform
 import shutil
@@ -29,7 +31,13 @@ def has_nvidia() -> bool:
     try:
         if not have("nvidia-smi"):
             return False
-        out = subprocess.check_output(["nvidia-smi", "-L"], text=True, timeout=5)
+        out = subprocess.check_output(
+            ["nvidia-smi", "-L"],
+            text=True,
+            timeout=5,
+            stdin=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
         return bool(out.strip())
     except Exception:
         return False
@@ -76,6 +84,25 @@ def decide_channel(force_gpu: bool | None, force_cpu: bool | None, force_rocm: b
     return "macOS default (CPU wheel, MPS inside)", ["install"] + pkgs
 
 
+def verify_torch(installed: bool = False) -> int:
+    """Import torch (slow: loads native libs) and print device capabilities."""
+    try:
+        import torch
+
+        if installed:
+            print(f"✅ Installed torch {torch.__version__}")
+        try:
+            print("CUDA available?", torch.cuda.is_available())
+            if hasattr(torch.backends, "mps"):
+                print("MPS available?", torch.backends.mps.is_available())
+        except Exception:
+            pass
+        return 0
+    except Exception as e:
+        print("⚠️ Installed but cannot import torch:", e)
+        return 1
+
+
 def main():
     ap = argparse.ArgumentParser()
     g = ap.add_mutually_exclusive_group()
@@ -83,22 +110,17 @@ def main():
     g.add_argument("--cpu", action="store_true", help="Force CPU")
     g.add_argument("--rocm", action="store_true", help="Force AMD ROCm (rocm6.0)")
     ap.add_argument("--extra", nargs="*", default=[], help="Extra pip args")
+    ap.add_argument("--verify", action="store_true", help="Import torch and report CUDA/MPS availability")
     args = ap.parse_args()
 
-    # already installed?
+    # already installed? (read package metadata; importing torch takes seconds)
     try:
-        import importlib
-
-        torch = importlib.import_module("torch")
-        print(f"PyTorch already installed: {torch.__version__}")
-        try:
-            print("CUDA available?", getattr(torch, "cuda", None) and torch.cuda.is_available())
-            if hasattr(torch.backends, "mps"):
-                print("MPS available?", torch.backends.mps.is_available())
-        except Exception:
-            pass
+        version = importlib.metadata.version("torch")
+        print(f"PyTorch already installed: {version}")
+        if args.verify:
+            return verify_torch()
         return 0
-    except Exception:
+    except importlib.metadata.PackageNotFoundError:
         pass
 
     channel, pip_args = decide_channel(args.gpu, args.cpu, args.rocm)
@@ -113,20 +135,7 @@ def main():
         print(f"Python detected: {pyver}. If wheels are missing, try Python 3.12 venv.")
         return code
 
-    try:
-        import torch
-
-        print(f"✅ Installed torch {torch.__version__}")
-        try:
-            print("CUDA available?", torch.cuda.is_available())
-            if hasattr(torch.backends, "mps"):
-                print("MPS available?", torch.backends.mps.is_available())
-        except Exception:
-            pass
-        return 0
-    except Exception as e:
-        print("⚠️ Installed but cannot import torch:", e)
-        return 1
+    return verify_torch(installed=True)
 
 
 if __name__ == "__main__":
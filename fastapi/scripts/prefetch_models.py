@@ -16,17 +16,28 @@ Dynamic prefetch for all available plugins.
     --models-only         same as --no-instance + --no-manifest = only REQUIRED_MODELS/required_models()
     --local-only          work from local cache only (HF local_files_only=True)
     --max-workers N       parallel downloads (1 = sequential)
-- Idempotent; keeps a de-dup set to avoid fetching the same model twice.
+    --hf-max-workers N    parallel file downloads inside one HF repo (default 8)
+- Idempotent; duplicate (type, id) entries are dropped before any download starts.
+- HF models fetched successfully are recorded in models_cache/.prefetch_done.json;
+  later runs skip them (no HEAD requests) while they are still in the local cache.
+- Faster HF downloads (optional): `pip install hf_transfer hf_xet`.
+  When installed, the Rust chunk-parallel backends are enabled automatically
+  (HF_HUB_ENABLE_HF_TRANSFER=1 / HF_XET_HIGH_PERFORMANCE=1); set them to 0 to opt out.
 """
 
 from __future__ import annotations
 
 import argparse
+import asyncio
+import atexit
+import importlib.util
 import json
 import os
+import random
 import sys
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
 from pathlib import Path
 from typing import Any
 
@@ -48,6 +59,28 @@ HF_HOME_DEFAULT.mkdir(parents=True, exist_ok=True)
 TORCH_HOME_DEFAULT.mkdir(parents=True, exist_ok=True)
 os.environ.setdefault("HF_HUB_DISABLE_SYMLINKS_WARNING", "1")
 
+
+def _enable_fast_backends() -> None:
+    """
+    Turn on the Rust download backends that are installed (an explicit env value wins).
+    huggingface_hub reads these once at import and errors out if hf_transfer is requested
+    but missing, so this must run before the first huggingface_hub import and only enable what exists.
+    """
+    if importlib.util.find_spec("hf_transfer") is not None:
+        os.environ.setdefault("HF_HUB_ENABLE_HF_TRANSFER", "1")
+    if importlib.util.find_spec("hf_xet") is not None:
+        os.environ.setdefault("HF_XET_HIGH_PERFORMANCE", "1")
+
+
+_enable_fast_backends()
+
+try:
+    import orjson  # type: ignore
+
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
 # Optional .env
 try:
     from dotenv import load_dotenv  # type: ignore
@@ -71,7 +104,7 @@ def warn(msg: str) -> None:
 
 def _read_json(path: Path) -> dict:
     try:
-        return json.loads(path.read_text(encoding="utf-8"))
+        return _loads(path.read_bytes())
     except Exception:
         return {}
 
@@ -80,6 +113,71 @@ def _read_json(path: Path) -> dict:
 
 # Keep a set of (type,id) to avoid duplicates across sources
 _PROCESSED: set[tuple[str, str]] = set()
+_PROCESSED_LOCK = threading.Lock()
+
+
+def _entry_key(entry: dict[str, Any]) -> tuple[str, str]:
+    return ((entry.get("type") or "").strip().lower(), (entry.get("id") or "").strip())
+
+
+def _dedup_jobs(jobs: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Drop entries without an id and keep the first entry per (type, id)."""
+    unique: dict[tuple[str, str], dict[str, Any]] = {}
+    for e in jobs:
+        key = _entry_key(e)
+        if key[1] and key not in unique:
+            unique[key] = e
+    return list(unique.values())
+
+
+# Models fetched successfully by earlier runs (persisted across invocations)
+_DONE_FILE = ROOT / "models_cache" / ".prefetch_done.json"
+_DONE_PREVIOUS: set[str] = set()
+_DONE_NOW: set[str] = set()
+
+
+def _load_done() -> None:
+    data = _read_json(_DONE_FILE)
+    ids = data.get("hf") if isinstance(data, dict) else None
+    if isinstance(ids, list):
+        _DONE_PREVIOUS.update(str(x) for x in ids)
+
+
+def _save_done() -> None:
+    if not _DONE_NOW:
+        return
+    try:
+        payload = {"hf": sorted(_DONE_PREVIOUS | _DONE_NOW)}
+        _DONE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        _DONE_FILE.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    except Exception as e:
+        warn(f"could not write {_DONE_FILE}: {e}")
+
+
+def _hf_cached(model_id: str) -> bool:
+    """True if the model's config.json is already in the local HF cache."""
+    try:
+        from huggingface_hub import try_to_load_from_cache  # type: ignore
+
+        return isinstance(try_to_load_from_cache(repo_id=model_id, filename="config.json"), str)
+    except Exception:
+        return False
+
+
+def _retry_delay(err: Exception, attempt: int, delay: float) -> float:
+    """
+    Seconds to wait before the next attempt: the server's Retry-After if present,
+    else exponential backoff with jitter so parallel workers do not retry in lockstep.
+    """
+    response = getattr(err, "response", None)  # HfHubHTTPError / requests.HTTPError
+    headers = getattr(response, "headers", None) or {}
+    retry_after = headers.get("Retry-After")
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+    return delay * (2 ** (attempt - 1)) * (0.5 + random.random())
 
 
 def _snapshot_hf(
@@ -89,36 +187,40 @@ def _snapshot_hf(
     local_only: bool = False,
     retries: int = 3,
     delay: float = 1.0,
+    hf_max_workers: int = 8,
 ) -> None:
-    """Download/config snapshot for HuggingFace models with simple retries."""
+    """Download a HuggingFace model repo with snapshot_download, retrying transient errors."""
     if dry:
         print(f"  - would snapshot HF: {model_id}")
         return
 
+    # Warm run: fetched before and still in the cache -> skip the network round-trips
+    if (local_only or model_id in _DONE_PREVIOUS) and _hf_cached(model_id):
+        print(f"  - already cached: {model_id}")
+        return
+
+    try:
+        from huggingface_hub import snapshot_download  # type: ignore
+    except ImportError:
+        warn(f"huggingface_hub is not installed; cannot prefetch {model_id}")
+        return
+
     last_err: Exception | None = None
     for attempt in range(1, retries + 1):
         try:
-            if not local_only:
-                # Fast path: fetch config only (often triggers minimal pull)
-                try:
-                    from transformers import AutoConfig  # type: ignore
-                    _ = AutoConfig.from_pretrained(model_id, trust_remote_code=True)
-                    return
-                except Exception:
-                    pass
-
-            from huggingface_hub import snapshot_download  # type: ignore
-
+            # every file goes through snapshot_download, so hf_transfer/hf_xet and max_workers apply
             snapshot_download(
                 repo_id=model_id,
                 local_files_only=local_only,
                 resume_download=not local_only,
+                max_workers=hf_max_workers,
             )
+            _DONE_NOW.add(model_id)
             return
         except Exception as e:
             last_err = e
             if attempt < retries:
-                time.sleep(delay * attempt)  # simple backoff
+                time.sleep(_retry_delay(e, attempt, delay))
             else:
                 warn(f"snapshot_download failed for {model_id} after {retries} attempts: {last_err}")
 
@@ -136,19 +238,26 @@ def _prefetch_torchvision(name: str, *, dry: bool = False) -> None:
         warn(f"unknown torchvision weight: {name}")
 
 
-def _prefetch_entry(entry: dict[str, Any], *, dry: bool = False, local_only: bool = False) -> None:
-    typ = (entry.get("type") or "").strip().lower()
-    mid = (entry.get("id") or "").strip()
+def _prefetch_entry(
+    entry: dict[str, Any],
+    *,
+    dry: bool = False,
+    local_only: bool = False,
+    hf_max_workers: int = 8,
+) -> None:
+    key = _entry_key(entry)
+    typ, mid = key
     if not mid:
         return
-    key = (typ, mid)
-    if key in _PROCESSED:
-        return
-    _PROCESSED.add(key)
+    # jobs are de-duplicated before dispatch; this is only a safety net across threads
+    with _PROCESSED_LOCK:
+        if key in _PROCESSED:
+            return
+        _PROCESSED.add(key)
 
     if typ in ("hf", "huggingface", "transformers"):
         info(f"Prefetch HF model: {mid}")
-        _snapshot_hf(mid, dry=dry, local_only=local_only)
+        _snapshot_hf(mid, dry=dry, local_only=local_only, hf_max_workers=hf_max_workers)
     elif typ in ("torchvision", "torch_hub"):
         info(f"Prefetch torchvision model: {mid}")
         _prefetch_torchvision(mid, dry=dry)
@@ -156,18 +265,66 @@ def _prefetch_entry(entry: dict[str, Any], *, dry: bool = False, local_only: boo
         info(f"Skip unknown model type: {entry}")
 
 
+async def _run_jobs(
+    jobs: list[dict[str, Any]],
+    *,
+    max_workers: int,
+    dry: bool = False,
+    local_only: bool = False,
+    hf_max_workers: int = 8,
+) -> None:
+    """Run blocking prefetch jobs on the default executor, at most max_workers at a time."""
+    loop = asyncio.get_running_loop()
+    sem = asyncio.Semaphore(max_workers)
+
+    async def worker(entry: dict[str, Any]) -> None:
+        async with sem:
+            fn = partial(_prefetch_entry, entry, dry=dry, local_only=local_only, hf_max_workers=hf_max_workers)
+            await loop.run_in_executor(None, fn)
+
+    await asyncio.gather(*(worker(e) for e in jobs))
+
+
+def _meta_names(meta: dict[str, Any]) -> tuple[str, str]:
+    """(name, folder) of a plugin meta; each falls back to the other."""
+    name = meta.get("name") or meta.get("folder") or "<unknown>"
+    return name, meta.get("folder") or name
+
+
+def _safe_loader_get(name: str) -> tuple[Any, Exception | None]:
+    """Return (instance, None) or (None, error); get_plugin_instance may import the plugin."""
+    try:
+        inst = loader.get_plugin_instance(name)
+    except Exception as e:
+        return None, e
+    if inst is None:
+        return None, LookupError(f"app.plugins.{name}.plugin could not be imported")
+    return inst, None
+
+
+def _plugin_metas() -> list[dict[str, Any]]:
+    """
+    One {"name", "folder", "manifest"} dict per discovered plugin.
+    Discovery only reads manifest.json files (no plugin imports), so a full scan is cheap.
+    """
+    loader.ensure_plugins_loaded()
+    metas: list[dict[str, Any]] = []
+    for name in loader.available_plugin_names():
+        manifest = loader.MANIFESTS.get(name) or {}
+        if not manifest:
+            continue  # the loader also lists plain modules of app.plugins (base.py, loader.py, ...)
+        metas.append({"name": name, "folder": manifest.get("folder") or name, "manifest": manifest})
+    return metas
+
+
 # ============ manifest helpers ============
 
 def _collect_from_manifest(meta: dict[str, Any]) -> list[dict]:
-    """Read models from plugin's manifest.json -> 'models'."""
-    path = meta.get("manifest_file")
+    """Read models from plugin's manifest.json -> 'models' (already parsed by the loader)."""
     out: list[dict] = []
-    if not path:
+    data = meta.get("manifest")
+    if not isinstance(data, dict):
         return out
-    p = Path(path)
-    if not p.exists():
-        return out
-    data = _read_json(p)
     models = data.get("models")
     if isinstance(models, list):
         for m in models:
@@ -190,6 +347,12 @@ def main(argv: list[str] | None = None) -> int:
 
     ap.add_argument("--local-only", action="store_true", help="Use local cache only (no network)")
     ap.add_argument("--max-workers", type=int, default=1, help="Parallel downloads (1 = sequential)")
+    ap.add_argument(
+        "--hf-max-workers",
+        type=int,
+        default=8,
+        help="Parallel file downloads within one HF repo (split across --max-workers)",
+    )
     args = ap.parse_args(argv)
 
     only = set((args.only or "").split(",")) - {""}
@@ -200,6 +363,10 @@ def main(argv: list[str] | None = None) -> int:
     no_manifest = bool(args.no_manifest or args.models_only)
     local_only = bool(args.local_only)
     max_workers = int(args.max_workers or 1)
+    hf_max_workers = max(1, int(args.hf_max_workers or 1))
+    if max_workers > 1:
+        # repos x files-per-repo threads: keep the total near --hf-max-workers
+        hf_max_workers = max(1, hf_max_workers // max_workers)
 
     print("HF_HOME =", os.getenv("HF_HOME"))
     print("TORCH_HOME =", os.getenv("TORCH_HOME"))
@@ -209,43 +376,49 @@ def main(argv: list[str] | None = None) -> int:
           f"no_manifest={no_manifest}",
           f"local_only={local_only}",
           f"max_workers={max_workers}",
+          f"hf_max_workers={hf_max_workers}",
           sep=" | ")
 
-    # Discover plugins via the project loader
-    loader.discover(reload=True)
-    metas = loader.all_meta()  # list of dicts: {"name","folder","manifest_file","plugin_file", ...}
+    if not dry:
+        _load_done()
+        atexit.register(_save_done)
+
+    # Discover plugins via the project loader; only the selected ones are imported below
+    metas = _plugin_metas()
+    selected = [
+        m
+        for m in metas
+        if (not only or not only.isdisjoint(_meta_names(m))) and skip.isdisjoint(_meta_names(m))
+    ]
+    print(f"Selected {len(selected)}/{len(metas)} plugins")
 
     jobs: list[dict[str, Any]] = []  # final model entries to prefetch
+    instances: dict[str, tuple[Any, Exception | None]] = {}  # name -> (instance, load error)
 
-    for meta in metas:
-        name = meta.get("name") or meta.get("folder") or "<unknown>"
-        folder = meta.get("folder") or name
-        if only and name not in only and folder not in only:
-            continue
-        if name in skip or folder in skip:
-            continue
+    for meta in selected:
+        name = _meta_names(meta)[0]
 
         info(f"Prefetch for plugin: {name}")
 
+        # Import/instantiate once; shared by instance.prefetch() and REQUIRED_MODELS below
+        if name not in instances:
+            instances[name] = _safe_loader_get(name)
+        inst, load_err = instances[name]
+
         # 1) instance.prefetch() (optional)
-        inst = None
         if not no_instance:
-            try:
-                inst = loader.get(name)  # may import plugin
-                pf = getattr(inst, "prefetch", None)
-                if callable(pf):
-                    if dry:
-                        print("  - would call instance.prefetch()")
-                    else:
-                        pf()
-            except Exception as e:
-                print(f"  ! prefetch() not available or failed for {name}: {e}")
-        else:
-            # still try to get the instance to read REQUIRED_MODELS / required_models()
-            try:
-                inst = loader.get(name)
-            except Exception:
-                inst = None
+            if load_err is not None:
+                print(f"  ! prefetch() not available or failed for {name}: {load_err}")
+            else:
+                try:
+                    pf = getattr(inst, "prefetch", None)
+                    if callable(pf):
+                        if dry:
+                            print("  - would call instance.prefetch()")
+                        else:
+                            pf()
+                except Exception as e:
+                    print(f"  ! prefetch() not available or failed for {name}: {e}")
 
         # 2) REQUIRED_MODELS / required_models()
         if inst:
@@ -271,17 +444,18 @@ def main(argv: list[str] | None = None) -> int:
             for entry in mf_models:
                 jobs.append(entry)
 
-    print(f"\nTotal planned entries: {len(jobs)} (before de-dup set)")
+    unique_jobs = _dedup_jobs(jobs)
+    print(f"\nTotal planned entries: {len(jobs)} ({len(jobs) - len(unique_jobs)} duplicates skipped)")
+    jobs = unique_jobs
 
-    # Execute downloads (de-dup happens inside _prefetch_entry)
+    # Execute downloads
     if max_workers > 1 and not dry:
-        with ThreadPoolExecutor(max_workers=max_workers) as ex:
-            futs = [ex.submit(_prefetch_entry, e, dry=dry, local_only=local_only) for e in jobs]
-            for _ in as_completed(futs):
-                pass
+        asyncio.run(
+            _run_jobs(jobs, max_workers=max_workers, dry=dry, local_only=local_only, hf_max_workers=hf_max_workers)
+        )
     else:
         for e in jobs:
-            _prefetch_entry(e, dry=dry, local_only=local_only)
+            _prefetch_entry(e, dry=dry, local_only=local_only, hf_max_workers=hf_max_workers)
 
     print(f"\nSummary: processed={len(_PROCESSED)} unique model entries.")
     print("\nDone — dynamic prefetch finished.")
@@ -1,5 +1,6 @@
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -19,7 +20,22 @@ def get_size(path: Path) -> int:
         return 0
     if path.is_file():
         return path.stat().st_size
-    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+    # Iterative scandir walk: DirEntry caches type info from the directory read,
+    # so each entry costs at most one stat. Symlinks are not followed (HF snapshots
+    # link to blobs, which are counted once under blobs/).
+    total = 0
+    stack = [str(path)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for e in it:
+                    if e.is_dir(follow_symlinks=False):
+                        stack.append(e.path)
+                    elif e.is_file(follow_symlinks=False):
+                        total += e.stat(follow_symlinks=False).st_size
+        except OSError:
+            continue
+    return total
 
 
 def human_readable(size: int) -> str:
@@ -53,11 +69,18 @@ def print_cache_info(name: str, path: Path):
         print("Warning: This path does not exist.")
         return
 
-    size = get_size(path)
+    top = sorted(p for p in path.iterdir() if p.is_dir())
+    # Subtrees are independent: size them concurrently, then add files at the root
+    sizes: list[int] = []
+    if top:
+        with ThreadPoolExecutor(max_workers=min(8, len(top))) as ex:
+            sizes = list(ex.map(get_size, top))
+    root_files = sum(p.stat().st_size for p in path.iterdir() if p.is_file())
+    size = sum(sizes) + root_files
     print(f"Total size: {human_readable(size)}")
     print("Subdirectories:")
-    for p in sorted([p for p in path.iterdir() if p.is_dir()]):
-        print(f"  - {p.name}")
+    for p, sz in zip(top, sizes, strict=True):
+        print(f"  - {p.name} ({human_readable(sz)})")
 
 
 def main():
@@ -9,12 +9,14 @@ from app.main import app
 
 BASE_URL = os.getenv("BASE_URL")
 _client = None if BASE_URL else TestClient(app)
+# Reuse one pooled connection for all live-server calls
+_session = requests.Session() if BASE_URL else None
 
 
 def get_json(path: str, method: str = "get", **kwargs):
     """Helper to fetch JSON from API (works with BASE_URL or TestClient)."""
     if BASE_URL:
-        resp = requests.request(method, f"{BASE_URL}{path}", timeout=10, **kwargs)
+        resp = _session.request(method, f"{BASE_URL}{path}", timeout=10, **kwargs)
     else:
         resp = _client.request(method, path, **kwargs)
     assert resp.status_code == 200
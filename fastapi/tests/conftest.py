@@ -1,37 +1,76 @@
+import os
+import shutil
+import tempfile
+
 import pytest
 from starlette.testclient import TestClient
 
-from app.main import app
+
+def pytest_configure(config):
+    """
+    Point the workflow cache at a throwaway directory before any test module imports the app.
+    app.workflows.registry reads WORKFLOWS_CACHE_DIR at import, so this cannot wait for a fixture.
+    """
+    if "WORKFLOWS_CACHE_DIR" not in os.environ:
+        config._workflows_cache_dir = tempfile.mkdtemp(prefix="workflows-cache-")
+        os.environ["WORKFLOWS_CACHE_DIR"] = config._workflows_cache_dir
+
+
+def pytest_unconfigure(config):
+    cache_dir = getattr(config, "_workflows_cache_dir", None)
+    if cache_dir:
+        os.environ.pop("WORKFLOWS_CACHE_DIR", None)
+        shutil.rmtree(cache_dir, ignore_errors=True)
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def test_client():
     """
-    Provides a test client for the FastAPI application.
+    Provides a test client for the FastAPI application (shared across the session).
+    Entering it runs the lifespan startup once; leaving it runs the shutdown.
     """
+    from app.main import app
+    from app.workflows import registry
+
+    registry.load_all()
     with TestClient(app) as client:
         yield client
 
 
+@pytest.fixture(scope="session")
+def client(test_client):
+    """Alias of test_client."""
+    return test_client
+
+
 def pytest_collection_modifyitems(config, items):
     """
     Automatically skip gpu_cuda/gpu_mps tests if the hardware is not available.
+    torch is only imported when at least one such test was collected.
     """
+    cuda_items, mps_items = [], []
+    for item in items:
+        kws = item.keywords
+        if "gpu_cuda" in kws:
+            cuda_items.append(item)
+        if "gpu_mps" in kws:
+            mps_items.append(item)
+    if not cuda_items and not mps_items:
+        return
+
     try:
         import torch
     except Exception:
         torch = None
 
-    cuda_available = bool(torch and torch.cuda.is_available())
-    mps_available = bool(torch and getattr(torch.backends, "mps", None) and torch.backends.mps.is_available())
-
-    skip_cuda = pytest.mark.skip(reason="CUDA not available")
-    skip_mps = pytest.mark.skip(reason="MPS not available")
-
-    for item in items:
-        if "gpu_cuda" in item.keywords and not cuda_available:
+    if cuda_items and not (torch and torch.cuda.is_available()):
+        skip_cuda = pytest.mark.skip(reason="CUDA not available")
+        for item in cuda_items:
             item.add_marker(skip_cuda)
-        if "gpu_mps" in item.keywords and not mps_available:
+
+    if mps_items and not (torch and getattr(torch.backends, "mps", None) and torch.backends.mps.is_available()):
+        skip_mps = pytest.mark.skip(reason="MPS not available")
+        for item in mps_items:
             item.add_marker(skip_mps)
 
 
@@ -0,0 +1,39 @@
+import pytest
+from fastapi import FastAPI, HTTPException
+from starlette.testclient import TestClient
+
+from app.core.errors import register_exception_handlers
+
+
+_CODES = [401, 403, 408, 413, 415, 429, 501, 503]
+
+
+@pytest.fixture(scope="module")
+def error_client():
+    """Small app whose /_raise/{code} route raises HTTPException(code), with the real handlers installed."""
+    app = FastAPI()
+    register_exception_handlers(app)
+
+    @app.api_route("/_raise/{code}", methods=["GET", "POST"])
+    def _raise(code: int):
+        raise HTTPException(status_code=code, detail=f"raised {code}")
+
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.mark.parametrize(
+    "code,method",
+    [(c, "POST" if c in (413, 415) else "GET") for c in _CODES],
+)
+def test_error_codes(error_client, code, method):
+    r = error_client.request(
+        method,
+        f"/_raise/{code}",
+        headers={"Accept": "application/json"},
+        json={"x": "y"} if method == "POST" else None,
+    )
+    assert r.status_code == code
+    body = r.json()
+    assert body["code"] == code
+    assert body["message"]
@@ -0,0 +1,92 @@
+# tests/test_error_pages.py
+import importlib.util
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from starlette.testclient import TestClient
+
+
+ERRORS_FILE = Path(__file__).resolve().parent / "test_errors.py"
+XSS = "<script>alert(1)</script>"
+
+
+@pytest.fixture(scope="module")
+def errors_mod():
+    """The JSON/HTML error handlers kept in tests/test_errors.py, imported under a private name."""
+    spec = importlib.util.spec_from_file_location("_error_handlers", ERRORS_FILE)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+@pytest.fixture(scope="module")
+def pages_client(errors_mod):
+    app = FastAPI()
+    errors_mod.register_exception_handlers(app)
+
+    @app.get("/_raise/{code}")
+    def _raise(code: int):
+        raise HTTPException(status_code=code, detail=XSS)
+
+    @app.get("/_items")
+    def _items(n: int):
+        return {"n": n}
+
+    @app.get("/_boom")
+    def _boom():
+        raise RuntimeError("secret")
+
+    with TestClient(app, raise_server_exceptions=False) as c:
+        yield c
+
+
+@pytest.mark.parametrize(
+    "params,headers",
+    [
+        ({"format": "html"}, {"Accept": "application/json"}),
+        ({"format": " HTML "}, {}),
+        ({}, {"Accept": "application/xhtml+xml"}),
+        ({}, {"Accept": "TEXT/HTML,application/json;q=0.9"}),
+    ],
+)
+def test_html_negotiation(pages_client, params, headers):
+    r = pages_client.get("/_raise/404", params=params, headers=headers)
+    assert r.status_code == 404
+    assert r.headers["content-type"].startswith("text/html")
+    assert "<html" in r.text
+    assert "<title>404 – Not Found</title>" in r.text
+
+
+def test_json_by_default(pages_client):
+    r = pages_client.get("/_raise/418", headers={"Accept": "application/json"})
+    assert r.status_code == 418
+    assert r.headers["content-type"].startswith("application/json")
+    assert r.json() == {"code": 418, "message": XSS, "path": "/_raise/418", "method": "GET"}
+
+
+def test_html_page_escapes_path(pages_client):
+    r = pages_client.get("/nope/<img src=x onerror=alert(1)>", params={"format": "html"})
+    assert r.status_code == 404
+    assert "<img" not in r.text
+    assert "&lt;img src=x onerror=alert(1)&gt;" in r.text
+
+
+def test_html_page_escapes_details(pages_client):
+    r = pages_client.get("/_items", params={"n": XSS, "format": "html"})
+    assert r.status_code == 422  # validation details echo the rejected input
+    assert "<script>" not in r.text
+    assert "&lt;script&gt;alert(1)&lt;/script&gt;" in r.text
+
+
+def test_html_page_does_not_reflect_detail(pages_client):
+    r = pages_client.get("/_raise/400", params={"format": "html"})
+    assert r.status_code == 400
+    assert "<script>" not in r.text
+
+
+def test_unhandled_error_hides_message(pages_client):
+    r = pages_client.get("/_boom", headers={"Accept": "application/json"})
+    assert r.status_code == 500
+    assert r.json()["message"] == "Internal Server Error"
+    assert "secret" not in r.text
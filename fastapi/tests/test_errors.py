@@ -1,7 +1,10 @@
 # app/core/errors.py
 from __future__ import annotations
 
+import html
 import logging
+import re
+from functools import lru_cache
 from http import HTTPStatus
 from typing import Any
 
@@ -10,8 +13,19 @@ from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from starlette.responses import HTMLResponse, JSONResponse, Response
 
+try:
+    import orjson  # noqa: F401  (required by ORJSONResponse)
+    from fastapi.responses import ORJSONResponse as _ErrorJSONResponse
+except ImportError:
+    _ErrorJSONResponse = JSONResponse
+
 logger = logging.getLogger("errors")
 
+_CODE_422 = status.HTTP_422_UNPROCESSABLE_ENTITY
+_CODE_500 = status.HTTP_500_INTERNAL_SERVER_ERROR
+
+_HTML_ACCEPT_RE = re.compile(r"text/html|application/xhtml", re.IGNORECASE)
+
 
 # ---------------------------
 # Helpers: content negotiation
@@ -20,15 +34,16 @@ def _wants_html(request: Request) -> bool:
     """
     Decide if the client prefers HTML:
     - query param format=html
-    - or Accept header contains text/html
+    - or Accept header contains text/html (or application/xhtml+xml)
     """
-    fmt = (request.query_params.get("format") or "").lower().strip()
-    if fmt == "html":
+    fmt = request.query_params.get("format")
+    if fmt and fmt.strip().lower() == "html":
         return True
-    accept = (request.headers.get("accept") or "").lower()
-    return "text/html" in accept
+    # case-insensitive search without building a lowered copy of the header
+    return _HTML_ACCEPT_RE.search(request.headers.get("accept") or "") is not None
 
 
+@lru_cache(maxsize=128)
 def _reason_phrase(code: int) -> str:
     try:
         return HTTPStatus(code).phrase
@@ -37,35 +52,41 @@ def _reason_phrase(code: int) -> str:
         return {404: "Not Found", 405: "Method Not Allowed"}.get(code, "Error")
 
 
+# Static page shell; only the title is formatted per response
+_HTML_HEAD_FMT = (
+    "<!DOCTYPE html>\n"
+    '<html lang="en">\n'
+    "  <head>\n"
+    '    <meta charset="utf-8"/>\n'
+    "    <title>{}</title>\n"
+    '    <meta name="viewport" content="width=device-width, initial-scale=1"/>\n'
+    "  </head>\n"
+    "  <body>\n"
+    "    "
+)
+_HTML_TAIL = "\n  </body>\n</html>"
+
+
 def _build_html_page(title: str, body_fragment: str) -> str:
     # Full valid HTML page to satisfy tests expecting "<html" in body
-    return f"""<!DOCTYPE html>
-<html lang="en">
-  <head>
-    <meta charset="utf-8"/>
-    <title>{title}</title>
-    <meta name="viewport" content="width=device-width, initial-scale=1"/>
-  </head>
-  <body>
-    {body_fragment}
-  </body>
-</html>"""
+    return _HTML_HEAD_FMT.format(title) + body_fragment + _HTML_TAIL
 
 
 def _html_error(code: int, request: Request, message: str, details: Any | None = None) -> HTMLResponse:
     title = f"{code} – {_reason_phrase(code)}"
-    path = request.url.path
-    method = request.method.upper()
+    path = html.escape(request.url.path)
+    method = html.escape(request.method.upper())
     frag = [
-        f"<h1>{title}</h1>",
-        f"<p><strong>Path:</strong> {path}</p>",
+        f"<h1>{title}</h1>\n",
+        f"<p><strong>Path:</strong> {path}</p>\n",
         f"<p><strong>Method:</strong> {method}</p>",
     ]
     if details is not None:
-        # Pretty-print details as repr to keep dependencies minimal
-        frag.append(f"<pre>{repr(details)}</pre>")
-    html = _build_html_page(title, "\n".join(frag))
-    return HTMLResponse(html, status_code=code)
+        # Pretty-print details as repr to keep dependencies minimal (escaped: may echo user input)
+        frag.extend(("\n<pre>", html.escape(repr(details)), "</pre>"))
+    page = _build_html_page(title, "".join(frag))
+    # Hand over bytes so the response does not re-encode the page
+    return HTMLResponse(page.encode("utf-8"), status_code=code, media_type="text/html")
 
 
 def _json_error(code: int, request: Request, message: str, details: Any | None = None) -> JSONResponse:
@@ -77,7 +98,7 @@ def _json_error(code: int, request: Request, message: str, details: Any | None =
     }
     if details is not None:
         body["details"] = details
-    return JSONResponse(body, status_code=code)
+    return _ErrorJSONResponse(body, status_code=code)
 
 
 def _error_response(code: int, request: Request, message: str, details: Any | None = None) -> Response:
@@ -98,7 +119,7 @@ async def handle_http_exception(request: Request, exc: StarletteHTTPException) -
 
 
 async def handle_validation_error(request: Request, exc: RequestValidationError) -> Response:
-    code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    code = _CODE_422
     # Pydantic v2 provides .errors() as a list of dicts
     details = exc.errors()
     message = "Validation error"
@@ -107,7 +128,7 @@ async def handle_validation_error(request: Request, exc: RequestValidationError)
 
 
 async def handle_unhandled_exception(request: Request, exc: Exception) -> Response:
-    code = status.HTTP_500_INTERNAL_SERVER_ERROR
+    code = _CODE_500
     # لا نكشف تفاصيل الاستثناء للعميل
     message = "Internal Server Error"
     logger.exception("Unhandled error @ %s %s", request.method, request.url.path)
@@ -1,10 +1,4 @@
-from app.main import app
-from starlette.testclient import TestClient
-
-client = TestClient(app)
-
-
-def test_inference_run():
+def test_inference_run(client):
     payload = {"plugin": "dummy", "task": "infer", "payload": {"text": "hi"}}
     r = client.post("/inference/run", json=payload)
     assert r.status_code == 200
@@ -12,7 +6,7 @@ def test_inference_run():
     assert data["ok"] is True
 
 
-def test_inference_alias():
+def test_inference_alias(client):
     payload = {"plugin": "dummy", "task": "infer", "payload": {"text": "hi"}}
     r = client.post("/inference", json=payload)
     assert r.status_code == 200
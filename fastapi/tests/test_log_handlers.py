@@ -0,0 +1,159 @@
+# tests/test_log_handlers.py
+import importlib.util
+import logging
+import time
+import types
+from logging.handlers import QueueHandler
+from pathlib import Path
+from queue import Queue
+
+import pytest
+
+
+LOGGING_FILE = Path(__file__).resolve().parent / "test_logging.py"
+
+
+@pytest.fixture(scope="module")
+def logmod():
+    """The buffered/rotating file logging kept in tests/test_logging.py, imported under a private name."""
+    spec = importlib.util.spec_from_file_location("_log_handlers", LOGGING_FILE)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+@pytest.fixture
+def root_logging():
+    """Restore the root logger's handlers and level after setup_logging() replaced them."""
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield root
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+def _settings(tmp_path, **overrides):
+    values = dict(
+        LOG_LEVEL="info",
+        LOG_LEVEL_UVICORN="warning",
+        LOG_LEVEL_PLUGINS="info",
+        LOG_CONSOLE_FORMAT="%(message)s",
+        LOG_ERRORS_TO_FILE=True,
+        ERROR_LOG_FILE=tmp_path / "errors.log",
+        ERROR_LOG_MAX_BYTES=1_048_576,
+        ERROR_LOG_BACKUPS=1,
+        LOG_PLUGINS_TO_FILE=True,
+        PLUGINS_LOG_FILE=tmp_path / "plugins.log",
+    )
+    values.update(overrides)
+    return types.SimpleNamespace(**values)
+
+
+def _stack(logmod, path, *, flush_interval):
+    """FastRotatingFileHandler behind a BatchingMemoryHandler behind a started FlushingQueueListener."""
+    fh = logmod.FastRotatingFileHandler(path, maxBytes=1_000_000, backupCount=2, encoding="utf-8")
+    fh.setFormatter(logging.Formatter("%(message)s"))
+    mem = logmod._buffered(fh, capacity=2048, flush_level=logging.ERROR)
+    q: Queue = Queue(-1)
+    listener = logmod.FlushingQueueListener(q, mem, flush_interval=flush_interval, respect_handler_level=True)
+    listener.start()
+    log = logging.getLogger(f"plugins.test.{path.stem}")
+    log.propagate = False
+    log.setLevel(logging.INFO)
+    log.handlers[:] = [QueueHandler(q)]
+    return log, q, listener
+
+
+def _lines(path: Path) -> list[str]:
+    return path.read_text(encoding="utf-8").splitlines() if path.exists() else []
+
+
+def test_stop_listener_drains_everything(logmod, root_logging, tmp_path, monkeypatch):
+    monkeypatch.setattr(logmod, "get_settings", lambda: _settings(tmp_path))
+    logmod.setup_logging()
+    plugin_log = logging.getLogger("plugins.drain")
+    for i in range(50):
+        plugin_log.info("record %d", i)
+    logging.getLogger("app.drain").error("boom")
+    logmod._stop_listener()
+
+    plugin_lines = _lines(tmp_path / "plugins.log")
+    assert [line.split("[plugins.drain] ", 1)[1] for line in plugin_lines] == [f"record {i}" for i in range(50)]
+    errors = _lines(tmp_path / "errors.log")
+    assert len(errors) == 1 and errors[0].endswith("boom")
+
+
+def test_error_flushes_immediately(logmod, tmp_path):
+    path = tmp_path / "plugins.log"
+    log, q, listener = _stack(logmod, path, flush_interval=60)
+    try:
+        log.info("quiet")
+        q.join()
+        assert _lines(path) == []  # buffered: no size, time or level trigger yet
+        log.error("loud")
+        q.join()
+        assert _lines(path) == ["quiet", "loud"]
+    finally:
+        listener.stop()
+
+
+def test_idle_records_flushed_within_interval(logmod, tmp_path):
+    path = tmp_path / "plugins.log"
+    log, _, listener = _stack(logmod, path, flush_interval=0.05)
+    try:
+        log.info("trickle")
+        deadline = time.monotonic() + 2
+        while not _lines(path) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert _lines(path) == ["trickle"]
+    finally:
+        listener.stop()
+
+
+def test_batch_is_one_stream_flush(logmod, tmp_path, monkeypatch):
+    path = tmp_path / "plugins.log"
+    fh = logmod.FastRotatingFileHandler(path, maxBytes=1_000_000, backupCount=1, encoding="utf-8")
+    fh.setFormatter(logging.Formatter("%(message)s"))
+    mem = logmod._buffered(fh, capacity=100, flush_level=logging.ERROR)
+    flushes = []
+    real_flush = logging.StreamHandler.flush
+    monkeypatch.setattr(logging.StreamHandler, "flush", lambda self: (flushes.append(self), real_flush(self)))
+
+    for i in range(99):
+        mem.handle(logging.makeLogRecord({"msg": f"r{i}", "levelno": logging.INFO, "levelname": "INFO"}))
+    assert flushes == [] and _lines(path) == []
+    mem.handle(logging.makeLogRecord({"msg": "r99", "levelno": logging.INFO, "levelname": "INFO"}))
+    assert flushes == [fh]
+    assert _lines(path) == [f"r{i}" for i in range(100)]
+    mem.close()
+    fh.close()
+
+
+def test_rollover_at_max_bytes(logmod, tmp_path):
+    path = tmp_path / "plugins.log"
+    fh = logmod.FastRotatingFileHandler(path, maxBytes=200, backupCount=2, encoding="utf-8")
+    fh.setFormatter(logging.Formatter("%(message)s"))
+    try:
+        for i in range(9):  # 9 × 20 bytes: stays under maxBytes
+            fh.handle(logging.makeLogRecord({"msg": f"{i:019d}"}))
+        assert not (tmp_path / "plugins.log.1").exists()
+        assert fh._approx_size == 180
+        fh.handle(logging.makeLogRecord({"msg": "x" * 19}))  # 200 bytes reaches maxBytes
+    finally:
+        fh.close()
+    assert _lines(tmp_path / "plugins.log.1") == [f"{i:019d}" for i in range(9)]
+    assert _lines(path) == ["x" * 19]
+
+
+def test_size_estimate_resumes_from_existing_file(logmod, tmp_path):
+    path = tmp_path / "plugins.log"
+    path.write_text("a" * 150, encoding="utf-8")
+    fh = logmod.FastRotatingFileHandler(path, maxBytes=200, backupCount=1, encoding="utf-8")
+    fh.setFormatter(logging.Formatter("%(message)s"))
+    try:
+        assert fh._approx_size == 150
+        fh.handle(logging.makeLogRecord({"msg": "b" * 59}))
+    finally:
+        fh.close()
+    assert (tmp_path / "plugins.log.1").read_text(encoding="utf-8") == "a" * 150
+    assert _lines(path) == ["b" * 59]
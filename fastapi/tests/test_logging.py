@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import atexit
 import logging
+import os
 import sys
-from logging.handlers import RotatingFileHandler
+import time
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from queue import Empty, Queue
 
 from app.core.config import get_settings
 
@@ -24,6 +28,115 @@ class StartsWithFilter(logging.Filter):
         return record.name.startswith(self.prefix)
 
 
+class FastRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler that keeps an in-process estimate of the file size and only
+    falls back to the parent's stat()/tell() check once the estimate reaches maxBytes.
+
+    Attributes:
+        _approx_size (int): Estimated current size of the log file in bytes.
+    """
+
+    def __init__(self, filename, *args, **kwargs) -> None:
+        super().__init__(filename, *args, **kwargs)
+        try:
+            self._approx_size = os.path.getsize(self.baseFilename)
+        except OSError:
+            self._approx_size = 0
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if self.maxBytes <= 0:
+            return False
+        msg_len = len(self.format(record).encode(self.encoding or "utf-8", "replace")) + len(self.terminator)
+        if self._approx_size + msg_len < self.maxBytes:
+            self._approx_size += msg_len
+            return False
+        if super().shouldRollover(record):
+            return True
+        # Estimate was pessimistic: resync with the real position
+        self._approx_size = (self.stream.tell() if self.stream else 0) + msg_len
+        return False
+
+    def doRollover(self) -> None:
+        super().doRollover()
+        self._approx_size = 0
+
+    _hold_flush = False
+
+    def flush(self) -> None:
+        # While a batch is written (see BatchingMemoryHandler) the stream is flushed once at the end
+        if not self._hold_flush:
+            super().flush()
+
+
+class BatchingMemoryHandler(MemoryHandler):
+    """
+    MemoryHandler whose flush writes the whole buffer with a single stream flush,
+    i.e. one stream flush per batch instead of one per record.
+    """
+
+    def flush(self) -> None:
+        with self.lock:
+            target = self.target
+            if target is None or not self.buffer:
+                return
+            hold = isinstance(target, FastRotatingFileHandler)
+            if hold:
+                target._hold_flush = True
+            try:
+                for record in self.buffer:
+                    target.handle(record)
+                self.buffer.clear()
+            finally:
+                if hold:
+                    target._hold_flush = False
+                    target.flush()
+
+
+class FlushingQueueListener(QueueListener):
+    """
+    QueueListener that also flushes its buffering handlers every ``flush_interval``
+    seconds, both while records keep arriving and when the queue goes idle, so
+    low-volume logs reach disk (and ``tail -f``) without waiting for a full buffer.
+
+    Attributes:
+        flush_interval (float): Maximum age in seconds of an unflushed record.
+    """
+
+    def __init__(self, queue: Queue, *handlers: logging.Handler, flush_interval: float = 1.0, **kwargs) -> None:
+        super().__init__(queue, *handlers, **kwargs)
+        self.flush_interval = flush_interval
+        self._last_flush = time.monotonic()
+
+    def dequeue(self, block: bool):
+        while True:
+            try:
+                return self.queue.get(block, timeout=self.flush_interval if block else None)
+            except Empty:
+                if not block:
+                    raise
+                self._flush_handlers()
+
+    def handle(self, record: logging.LogRecord) -> None:
+        super().handle(record)
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self._flush_handlers()
+
+    def _flush_handlers(self) -> None:
+        for h in self.handlers:
+            h.flush()
+        self._last_flush = time.monotonic()
+
+
+_FLUSH_INTERVAL = 1.0  # seconds a buffered record may wait before it is written
+_LEVELS: dict[str, int] = {
+    n: getattr(logging, n) for n in ("CRITICAL", "FATAL", "ERROR", "WARNING", "WARN", "INFO", "DEBUG", "NOTSET")
+}
+_FILE_FORMATTER = logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s")
+_ERRORS_LOGGER = logging.getLogger("errors")
+_UVICORN_ACCESS_LOGGER = logging.getLogger("uvicorn.access")
+
+
 def _level(name: str, default: int) -> int:
     """
     Convert a log level name to its corresponding logging module constant.
@@ -35,10 +148,48 @@ def _level(name: str, default: int) -> int:
     Returns:
         int: The logging level constant.
     """
-    try:
-        return getattr(logging, str(name).upper())
-    except Exception:
-        return default
+    return _LEVELS.get(str(name).upper(), default)
+
+
+def _buffered(target: logging.Handler, capacity: int, flush_level: int) -> MemoryHandler:
+    """
+    Wrap a file handler so records are written in batches.
+
+    Args:
+        target (logging.Handler): The handler that performs the actual write.
+        capacity (int): Number of records to buffer before flushing.
+        flush_level (int): Records at or above this level flush immediately.
+
+    Returns:
+        MemoryHandler: Buffering handler to attach instead of the target.
+    """
+    mem = BatchingMemoryHandler(capacity=capacity, flushLevel=flush_level, target=target, flushOnClose=True)
+    # Apply the target's level/filters before buffering so the buffer only holds records it will write
+    mem.setLevel(target.level)
+    for f in target.filters:
+        mem.addFilter(f)
+    # no atexit hook per handler: _stop_listener() closes it at exit and flushOnClose writes the rest
+    return mem
+
+
+_listener: FlushingQueueListener | None = None
+
+
+def _stop_listener() -> None:
+    """Drain the log queue, then flush and close the file handlers."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for h in _listener.handlers:
+            # MemoryHandler.close() flushes and drops its target without closing it
+            target = getattr(h, "target", None)
+            h.close()
+            if target is not None:
+                target.close()
+        _listener = None
+
+
+atexit.register(_stop_listener)
 
 
 def setup_logging() -> None:
@@ -52,6 +203,7 @@ def setup_logging() -> None:
       3. Plugins-specific log file (if enabled).
       4. Specific logger levels.
     """
+    global _listener
     s = get_settings()
 
     # Console handler (root)
@@ -61,41 +213,55 @@ def setup_logging() -> None:
 
     root = logging.getLogger()
     root.setLevel(_level(s.LOG_LEVEL, logging.INFO))
+    _stop_listener()
+    for h in root.handlers:
+        h.close()  # flushes any buffered records from a previous setup
     root.handlers.clear()
     root.addHandler(console)
+    file_handlers: list[logging.Handler] = []
 
     # Error log file (ERROR+) if enabled
     if s.LOG_ERRORS_TO_FILE:
         err_path: Path = s.ERROR_LOG_FILE
         err_path.parent.mkdir(parents=True, exist_ok=True)
-        err_fh = RotatingFileHandler(
+        err_fh = FastRotatingFileHandler(
             err_path,
             maxBytes=s.ERROR_LOG_MAX_BYTES,
             backupCount=s.ERROR_LOG_BACKUPS,
             encoding="utf-8",
         )
         err_fh.setLevel(logging.ERROR)
-        err_fh.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s"))
-        root.addHandler(err_fh)
+        err_fh.setFormatter(_FILE_FORMATTER)
+        # the sink only accepts ERROR+, so every record it buffers must be written at once
+        file_handlers.append(_buffered(err_fh, capacity=1024, flush_level=logging.ERROR))
 
     # Plugins log file (plugins.* only) if enabled
     if s.LOG_PLUGINS_TO_FILE:
         pl_path: Path = s.PLUGINS_LOG_FILE
         pl_path.parent.mkdir(parents=True, exist_ok=True)
-        pl_fh = RotatingFileHandler(
+        pl_fh = FastRotatingFileHandler(
             pl_path,
             maxBytes=2_000_000,
             backupCount=3,
             encoding="utf-8",
         )
         pl_fh.setLevel(_level(s.LOG_LEVEL_PLUGINS, logging.INFO))
-        pl_fh.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s"))
+        pl_fh.setFormatter(_FILE_FORMATTER)
         pl_fh.addFilter(StartsWithFilter("plugins"))
-        root.addHandler(pl_fh)
+        file_handlers.append(_buffered(pl_fh, capacity=2048, flush_level=logging.ERROR))
+
+    # File writes happen on a background listener thread; callers only enqueue
+    if file_handlers:
+        log_q: Queue = Queue(-1)
+        root.addHandler(QueueHandler(log_q))
+        _listener = FlushingQueueListener(
+            log_q, *file_handlers, flush_interval=_FLUSH_INTERVAL, respect_handler_level=True
+        )
+        _listener.start()
 
     # Specific logger configurations
-    logging.getLogger("errors").setLevel(logging.ERROR)
-    logging.getLogger("uvicorn.access").setLevel(_level(s.LOG_LEVEL_UVICORN, logging.WARNING))
+    _ERRORS_LOGGER.setLevel(logging.ERROR)
+    _UVICORN_ACCESS_LOGGER.setLevel(_level(s.LOG_LEVEL_UVICORN, logging.WARNING))
 
 
 def main() -> None:
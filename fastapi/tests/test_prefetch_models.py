@@ -0,0 +1,189 @@
+# tests/test_prefetch_models.py
+import asyncio
+import importlib.util
+import os
+import subprocess
+import sys
+import threading
+import time
+import types
+from pathlib import Path
+
+import pytest
+
+
+SCRIPT = Path(__file__).resolve().parents[1] / "scripts" / "prefetch_models.py"
+
+
+@pytest.fixture(scope="module")
+def prefetch():
+    """Import scripts/prefetch_models.py as a module, undoing its HF_HOME/TORCH_HOME env defaults afterwards."""
+    saved = dict(os.environ)
+    spec = importlib.util.spec_from_file_location("prefetch_models", SCRIPT)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    yield mod
+    os.environ.clear()
+    os.environ.update(saved)
+
+
+@pytest.fixture
+def fake_hub(monkeypatch):
+    """Stand-in huggingface_hub that records each snapshot_download call and the env it ran under."""
+    calls = []
+
+    def snapshot_download(**kwargs):
+        calls.append((kwargs, os.environ.get("HF_HUB_ENABLE_HF_TRANSFER"), os.environ.get("HF_XET_HIGH_PERFORMANCE")))
+
+    hub = types.ModuleType("huggingface_hub")
+    hub.snapshot_download = snapshot_download
+    hub.try_to_load_from_cache = lambda **kw: None
+    monkeypatch.setitem(sys.modules, "huggingface_hub", hub)
+    return calls
+
+
+def test_dry_run_smoke():
+    r = subprocess.run(
+        [sys.executable, str(SCRIPT), "--dry-run"],
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert r.returncode == 0, r.stderr
+    assert "Prefetch for plugin: dummy" in r.stdout
+    assert "Done — dynamic prefetch finished." in r.stdout
+
+
+def test_dry_run_only_one_plugin():
+    r = subprocess.run(
+        [sys.executable, str(SCRIPT), "--dry-run", "--only", "dummy"],
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert r.returncode == 0, r.stderr
+    assert "Selected 1/" in r.stdout
+    assert "Prefetch for plugin: whisper" not in r.stdout
+
+
+def test_fast_backends_enabled_only_when_installed(prefetch, monkeypatch):
+    monkeypatch.delenv("HF_HUB_ENABLE_HF_TRANSFER", raising=False)
+    monkeypatch.delenv("HF_XET_HIGH_PERFORMANCE", raising=False)
+    monkeypatch.setattr(importlib.util, "find_spec", lambda name: object() if name == "hf_xet" else None)
+    prefetch._enable_fast_backends()
+    assert "HF_HUB_ENABLE_HF_TRANSFER" not in os.environ
+    assert os.environ["HF_XET_HIGH_PERFORMANCE"] == "1"
+
+    # an explicit opt-out is kept
+    monkeypatch.setenv("HF_XET_HIGH_PERFORMANCE", "0")
+    prefetch._enable_fast_backends()
+    assert os.environ["HF_XET_HIGH_PERFORMANCE"] == "0"
+
+
+def test_snapshot_goes_through_snapshot_download(prefetch, fake_hub, monkeypatch):
+    monkeypatch.setenv("HF_HUB_ENABLE_HF_TRANSFER", "1")
+    monkeypatch.setenv("HF_XET_HIGH_PERFORMANCE", "1")
+    # transformers being importable must not short-circuit the snapshot
+    monkeypatch.setitem(sys.modules, "transformers", types.ModuleType("transformers"))
+    monkeypatch.setattr(prefetch, "_DONE_NOW", set())
+
+    prefetch._snapshot_hf("org/model", hf_max_workers=4)
+
+    assert len(fake_hub) == 1
+    kwargs, hf_transfer, hf_xet = fake_hub[0]
+    assert kwargs["repo_id"] == "org/model"
+    assert kwargs["max_workers"] == 4
+    assert (hf_transfer, hf_xet) == ("1", "1")
+    assert prefetch._DONE_NOW == {"org/model"}
+
+
+def test_dedup_jobs_keeps_first_per_type_and_id(prefetch):
+    jobs = [
+        {"type": "hf", "id": "org/a", "src": "required"},
+        {"type": "HF ", "id": " org/a", "src": "manifest"},
+        {"type": "torchvision", "id": "org/a"},
+        {"type": "hf", "id": ""},
+        {"type": "hf"},
+        {"type": "hf", "id": "org/b"},
+    ]
+    out = prefetch._dedup_jobs(jobs)
+    assert [(e.get("type"), e.get("id")) for e in out] == [("hf", "org/a"), ("torchvision", "org/a"), ("hf", "org/b")]
+    assert out[0]["src"] == "required"
+
+
+def test_retry_delay_prefers_retry_after(prefetch, monkeypatch):
+    err = Exception("429")
+    err.response = types.SimpleNamespace(headers={"Retry-After": "7"})
+    assert prefetch._retry_delay(err, 1, 1.0) == 7.0
+
+    # no/invalid header: exponential backoff scaled by jitter in [0.5, 1.5)
+    monkeypatch.setattr(prefetch.random, "random", lambda: 0.5)
+    err.response.headers = {"Retry-After": "soon"}
+    assert prefetch._retry_delay(err, 1, 1.0) == 1.0
+    assert prefetch._retry_delay(Exception(), 3, 1.0) == 4.0
+
+
+def test_snapshot_retries_with_backoff(prefetch, monkeypatch):
+    attempts, sleeps = [], []
+
+    def flaky(**kwargs):
+        attempts.append(kwargs)
+        if len(attempts) < 3:
+            raise ConnectionError("reset")
+
+    hub = types.ModuleType("huggingface_hub")
+    hub.snapshot_download = flaky
+    monkeypatch.setitem(sys.modules, "huggingface_hub", hub)
+    monkeypatch.setattr(prefetch.time, "sleep", sleeps.append)
+    monkeypatch.setattr(prefetch.random, "random", lambda: 0.5)
+    monkeypatch.setattr(prefetch, "_DONE_NOW", set())
+
+    prefetch._snapshot_hf("org/flaky", retries=3, delay=0.5)
+
+    assert len(attempts) == 3
+    assert sleeps == [0.5, 1.0]
+    assert prefetch._DONE_NOW == {"org/flaky"}
+
+
+def test_done_file_round_trip(prefetch, monkeypatch, tmp_path):
+    done_file = tmp_path / "models_cache" / ".prefetch_done.json"
+    monkeypatch.setattr(prefetch, "_DONE_FILE", done_file)
+    monkeypatch.setattr(prefetch, "_DONE_PREVIOUS", {"org/old"})
+    monkeypatch.setattr(prefetch, "_DONE_NOW", {"org/new"})
+    prefetch._save_done()
+
+    monkeypatch.setattr(prefetch, "_DONE_PREVIOUS", set())
+    prefetch._load_done()
+    assert prefetch._DONE_PREVIOUS == {"org/old", "org/new"}
+
+
+def test_warm_run_skips_cached_models(prefetch, fake_hub, monkeypatch):
+    monkeypatch.setattr(prefetch, "_DONE_PREVIOUS", {"org/cached"})
+    monkeypatch.setattr(prefetch, "_hf_cached", lambda model_id: True)
+    prefetch._snapshot_hf("org/cached")
+    assert fake_hub == []
+
+
+def test_hf_max_workers_split_across_jobs(prefetch, capsys):
+    assert prefetch.main(["--dry-run", "--only", "dummy", "--max-workers", "2", "--hf-max-workers", "8"]) == 0
+    assert "hf_max_workers=4" in capsys.readouterr().out
+
+
+def test_run_jobs_caps_concurrency(prefetch, monkeypatch):
+    lock = threading.Lock()
+    running, peak, seen = [0], [0], []
+
+    def fake_entry(entry, **kwargs):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.02)
+        with lock:
+            running[0] -= 1
+            seen.append(entry["id"])
+
+    monkeypatch.setattr(prefetch, "_prefetch_entry", fake_entry)
+    jobs = [{"type": "hf", "id": f"org/m{i}"} for i in range(6)]
+    asyncio.run(prefetch._run_jobs(jobs, max_workers=2))
+    assert sorted(seen) == sorted(j["id"] for j in jobs)
+    assert peak[0] <= 2
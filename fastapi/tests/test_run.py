@@ -1,4 +1,5 @@
 # tests/test_run.py
+import os
 import socket
 
 import uvicorn
@@ -8,11 +9,16 @@ from app.core.logging_ import setup_logging
 
 
 def find_free_port(start=8000, tries=50):
-    for p in range(start, start + tries):
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            if s.connect_ex(("127.0.0.1", p)) != 0:
-                return p
-    return start
+    """Return `start` if it can be bound, else a free port chosen by the kernel (`tries` kept for compatibility)."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        if os.name != "nt":  # on Windows SO_REUSEADDR would allow binding a port that is in use
+            s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            s.bind(("127.0.0.1", start))
+            return start
+        except OSError:
+            s.bind(("127.0.0.1", 0))
+            return s.getsockname()[1]
 
 
 def main():
@@ -0,0 +1,82 @@
+# tests/test_workflows_registry.py
+import json
+
+import pytest
+
+from app.workflows import registry
+
+
+@pytest.fixture(autouse=True)
+def _restore_registry():
+    """Reload the real workflows after each test, even when it fails midway."""
+    yield
+    registry.load_all()
+
+
+def _make_workflow(root, name, steps):
+    d = root / name
+    d.mkdir()
+    (d / "manifest.json").write_text(json.dumps({"name": name}), encoding="utf-8")
+    (d / "workflow.json").write_text(json.dumps({"steps": steps}), encoding="utf-8")
+    return d
+
+
+def test_load_all_reads_and_caches(tmp_path, monkeypatch):
+    monkeypatch.setattr(registry, "CACHE_DIR", tmp_path / "cache")
+    root = tmp_path / "workflows"
+    root.mkdir()
+    _make_workflow(root, "wf_a", [{"plugin": "dummy", "task": "infer"}])
+    _make_workflow(root, "wf_b", [])
+    (root / "not_a_workflow").mkdir()
+
+    registry.load_all(root)
+    assert sorted(registry._REGISTRY) == ["wf_a", "wf_b"]
+    assert registry.get_workflow("wf_a")["steps"][0]["plugin"] == "dummy"
+    assert len(list((tmp_path / "cache").glob("workflows-*.pkl"))) == 1
+
+    # editing a sequence file invalidates the cache
+    (root / "wf_b" / "workflow.json").write_text(json.dumps({"steps": [{"plugin": "x"}]}), encoding="utf-8")
+    registry.load_all(root)
+    assert registry.get_workflow("wf_b")["steps"] == [{"plugin": "x"}]
+
+
+def test_cache_tracks_sequence_files_outside_the_folder(tmp_path, monkeypatch):
+    monkeypatch.setattr(registry, "CACHE_DIR", tmp_path / "cache")
+    root = tmp_path / "workflows"
+    root.mkdir()
+    d = root / "wf_sub"
+    (d / "seq").mkdir(parents=True)
+    (d / "manifest.json").write_text(
+        json.dumps({"name": "wf_sub", "sequence_file": "seq/steps.json"}), encoding="utf-8"
+    )
+    seq = d / "seq" / "steps.json"
+    seq.write_text(json.dumps({"steps": []}), encoding="utf-8")
+
+    registry.load_all(root)
+    assert registry.get_workflow("wf_sub")["steps"] == []
+
+    seq.write_text(json.dumps({"steps": [{"plugin": "y"}]}), encoding="utf-8")
+    registry.load_all(root)
+    assert registry.get_workflow("wf_sub")["steps"] == [{"plugin": "y"}]
+
+
+def test_cache_key_includes_schema_and_old_files_are_pruned(tmp_path, monkeypatch):
+    cache = tmp_path / "cache"
+    monkeypatch.setattr(registry, "CACHE_DIR", cache)
+    root = tmp_path / "workflows"
+    root.mkdir()
+    _make_workflow(root, "wf_a", [])
+    other = tmp_path / "other"
+    other.mkdir()
+    _make_workflow(other, "wf_o", [])
+    registry.load_all(other)
+
+    registry.load_all(root)
+    first = set(cache.glob("workflows-*.pkl"))
+    monkeypatch.setattr(registry, "_CACHE_SCHEMA", registry._CACHE_SCHEMA + 1)
+    registry.load_all(root)
+    second = set(cache.glob("workflows-*.pkl"))
+
+    assert len(first) == len(second) == 2  # one per root
+    assert first != second  # schema bump -> new key, previous file for this root removed
+    assert registry.get_workflow("wf_a") == {"steps": []}
@@ -2,13 +2,20 @@
 from __future__ import annotations
 
 import argparse
+import os
+import re
 import subprocess
 import sys
 from pathlib import Path
+from typing import Any
 
 
 ROOT = Path(__file__).resolve().parent
 
+# Snapshot of local branch state, filled by git_status_once() and dropped on mutating operations.
+_GIT_CACHE: dict[str, Any] | None = None
+_AHEAD_RE = re.compile(r"ahead (\d+)")
+
 
 # ------------------------
 # Shell helpers
@@ -60,6 +67,42 @@ def is_git_repo() -> bool:
         return False
 
 
+def git_status_once() -> dict[str, Any]:
+    """
+    Collect current branch, local branches and upstream tracking info with a single git call.
+
+    Returns:
+        dict[str, Any]: ``{"current": str, "branches": {name: {"upstream": str, "ahead": int}}}``.
+    """
+    global _GIT_CACHE
+    if _GIT_CACHE is not None:
+        return _GIT_CACHE
+
+    out = run_out(
+        [
+            "git",
+            "for-each-ref",
+            "--format=%(HEAD)\t%(refname:short)\t%(upstream:short)\t%(upstream:track)",
+            "refs/heads/",
+        ]
+    )
+    current = "HEAD"  # what `git rev-parse --abbrev-ref HEAD` reports when detached
+    branches: dict[str, dict[str, Any]] = {}
+    for line in out.splitlines():
+        head, name, upstream, track = (line.split("\t") + ["", "", ""])[:4]
+        m = _AHEAD_RE.search(track)
+        branches[name] = {"upstream": upstream, "ahead": int(m.group(1)) if m else 0}
+        if head == "*":
+            current = name
+    _GIT_CACHE = {"current": current, "branches": branches}
+    return _GIT_CACHE
+
+
+def _invalidate_git_cache() -> None:
+    global _GIT_CACHE
+    _GIT_CACHE = None
+
+
 def current_branch() -> str:
     """
     Get the name of the current Git branch.
@@ -67,7 +110,7 @@ def current_branch() -> str:
     Returns:
         str: The name of the current branch.
     """
-    return run_out(["git", "rev-parse", "--abbrev-ref", "HEAD"])
+    return git_status_once()["current"]
 
 
 def local_branch_exists(name: str) -> bool:
@@ -80,8 +123,7 @@ def local_branch_exists(name: str) -> bool:
     Returns:
         bool: True if branch exists locally, False otherwise.
     """
-    out = run_out(["git", "branch", "--list", name])
-    return bool(out)
+    return name in git_status_once()["branches"]
 
 
 def checkout_branch(name: str, create: bool = False) -> None:
@@ -96,9 +138,11 @@ def checkout_branch(name: str, create: bool = False) -> None:
         SystemExit: If the branch does not exist and creation is not allowed.
     """
     if local_branch_exists(name):
+        _invalidate_git_cache()
         run(["git", "checkout", name])
     else:
         if create:
+            _invalidate_git_cache()
             run(["git", "checkout", "-b", name])
         else:
             raise SystemExit(f"Branch '{name}' not found locally. Use --create-branch to create it.")
@@ -114,6 +158,7 @@ def try_commit(message: str) -> bool:
     Returns:
         bool: True if commit succeeds, False otherwise.
     """
+    _invalidate_git_cache()
     try:
         run(["git", "commit", "-m", message])
         return True
@@ -131,6 +176,10 @@ def ahead_count(branch: str) -> int:
     Returns:
         int: Number of commits ahead, or 0 if not available.
     """
+    info = git_status_once()["branches"].get(branch)
+    if info and info["upstream"] == f"origin/{branch}":
+        return info["ahead"]
+    # no matching upstream configured: ask git directly
     try:
         out = run_out(["git", "rev-list", "--left-right", "--count", f"origin/{branch}...{branch}"])
         _, ahead = map(int, out.split())
@@ -139,6 +188,39 @@ def ahead_count(branch: str) -> int:
         return 0
 
 
+def changed_files() -> list[str]:
+    """
+    List files that would be included by ``git add -A`` (staged, modified and untracked, minus deletions).
+
+    Returns:
+        list[str]: Absolute paths (porcelain output is relative to the top level, not to ROOT).
+    """
+    top = run_out(["git", "rev-parse", "--show-toplevel"])
+    print("$ git status --porcelain=v1 -z --untracked-files=all")
+    cp = subprocess.run(
+        ["git", "status", "--porcelain=v1", "-z", "--untracked-files=all"],
+        cwd=ROOT,
+        check=True,
+        capture_output=True,
+    )
+    # NUL-separated "XY <path>" records, unquoted; a rename/copy is followed by an extra record with its source
+    records = cp.stdout.decode("utf-8", "surrogateescape").split("\0")
+    files: list[str] = []
+    i = 0
+    while i < len(records):
+        rec = records[i]
+        i += 1
+        if len(rec) < 4:
+            continue
+        status, path = rec[:2], rec[3:]
+        if "R" in status or "C" in status:
+            i += 1  # skip the original path
+        if "D" in status:
+            continue
+        files.append(os.path.join(top, path))
+    return files
+
+
 def push_current(remote: str = "origin") -> None:
     """
     Push the current HEAD to the given remote.
@@ -186,9 +268,16 @@ def commit_flow(
         checkout_branch(target_branch, create=create_branch)
         active_branch = target_branch
 
-    if not skip_hooks or only_hooks:
+    if only_hooks:
         print("Running pre-commit hooks on all files...")
         run(["pre-commit", "run", "-a"], check=False)
+    elif not skip_hooks:
+        files = changed_files()
+        if files:
+            print(f"Running pre-commit hooks on {len(files)} changed file(s)...")
+            run(["pre-commit", "run", "--files", *files], check=False)
+        else:
+            print("No changes detected; skipping pre-commit hooks.")
 
     if only_hooks:
         return 0
@@ -283,14 +372,15 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
         argparse.Namespace: Parsed arguments.
     """
     ap = argparse.ArgumentParser(
-        description="Run pre-commit, add, commit (with retry if hooks modify files), and optionally push."
+        description="Run pre-commit, add, commit (with retry if hooks modify files), and optionally push.",
+        epilog="Environment: PUSHONLY=1 behaves like --push-only; SKIP_HOOKS=1 behaves like --skip-hooks.",
     )
     ap.add_argument("-m", "--message", default="chore: cleanup commit", help="Commit message.")
     ap.add_argument("--push", action="store_true", help="Push after committing.")
     ap.add_argument("--remote", default="origin", help="Remote name to push to (default: origin).")
     ap.add_argument("--branch", help="Work on this branch (checkout before committing).")
     ap.add_argument("--create-branch", action="store_true", help="Create branch if it doesn't exist locally.")
-    ap.add_argument("--skip-hooks", action="store_true", help="Skip running 'pre-commit run -a' before committing.")
+    ap.add_argument("--skip-hooks", action="store_true", help="Skip running pre-commit before committing.")
     ap.add_argument("--menu", action="store_true", help="Show an interactive numbered menu.")
     ap.add_argument("--only-hooks", action="store_true", help="Run pre-commit only, without committing or pushing.")
     ap.add_argument("--push-only", action="store_true", help="Push current HEAD without committing.")
@@ -319,8 +409,8 @@ def main(argv: list[str] | None = None) -> int:
         remote=args.remote,
         branch=args.branch,
         create_branch=bool(args.create_branch),
-        skip_hooks=bool(args.skip_hooks),
-        push_only=bool(args.push_only),
+        skip_hooks=bool(args.skip_hooks) or os.environ.get("SKIP_HOOKS") == "1",
+        push_only=bool(args.push_only) or os.environ.get("PUSHONLY") == "1",
         only_hooks=bool(args.only_hooks),
     )
 
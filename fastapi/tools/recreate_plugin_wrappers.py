@@ -1,61 +1,40 @@
 # tools/recreate_plugin_wrappers.py
 from __future__ import annotations
 
+import ast
 import importlib
 import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import cache
 from pathlib import Path
 from typing import Any
 
 
+try:
+    import orjson
+
+    def _dump_manifest(obj: dict[str, Any]) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+
+except ImportError:
+
+    def _dump_manifest(obj: dict[str, Any]) -> bytes:
+        return (json.dumps(obj, ensure_ascii=False, indent=2) + "\n").encode("utf-8")
+
+
 ROOT = Path(__file__).resolve().parents[1]
 SERVICES_DIR = ROOT / "app" / "services"
 PLUGINS_DIR = ROOT / "app" / "plugins"
 
+# The wrapper logic lives in app/plugins/_wrapper_base.py; each plugin.py only binds name and tasks.
 WRAPPER_TEMPLATE = """
-from __future__ import annotations
-import importlib
-from typing import Any
-from app.plugins.base import AIPlugin
-
-class Plugin(AIPlugin):
-    name = "__NAME__"
-    tasks = __TASKS__
-    provider = "local"
-    _impl = None  # instance of app.services.__NAME__.service.Plugin
-
-    def __init__(self) -> None:
-        self.name = "__NAME__"
-        self.tasks = list(__TASKS__)
-
-    def load(self) -> None:
-        if self._impl is None:
-            mod = importlib.import_module("app.services.__NAME__.service")
-            Impl = getattr(mod, "Plugin")
-            self._impl = Impl()
-            if hasattr(self._impl, "load"):
-                self._impl.load()
-        if not self.tasks and self._impl is not None:
-            svc_tasks = getattr(self._impl, "tasks", [])
-            if isinstance(svc_tasks, (list, tuple, set)):
-                self.tasks = list(svc_tasks)
-
-    def infer(self, payload: dict[str, Any]) -> Any:
-        # generic fallback: dispatch by 'task' field
-        self.load()
-        task = (payload or {}).get("task")
-        if isinstance(task, str) and hasattr(self._impl, task):
-            return getattr(self._impl, task)(payload)
-        raise AttributeError(f"Unknown task: {task!r}")
-
-    def __getattr__(self, item: str):
-        # ensure tasks are populated before checking
-        self.load()
-        if item in self.tasks and hasattr(self._impl, item):
-            def _call(payload: dict[str, Any]):
-                self.load()
-                return getattr(self._impl, item)(payload)
-            return _call
-        raise AttributeError(item)
+# Generated by tools/recreate_plugin_wrappers.py -- edit app/plugins/_wrapper_base.py instead.
+from app.plugins._wrapper_base import make_plugin
+
+
+Plugin = make_plugin(__NAME__, __TASKS__)
 """.lstrip()
 
 
@@ -63,35 +42,98 @@ def discover_services() -> list[str]:
     names: list[str] = []
     if not SERVICES_DIR.exists():
         return names
-    for d in SERVICES_DIR.iterdir():
-        if d.is_dir() and (d / "service.py").exists():
-            names.append(d.name)
+    with os.scandir(SERVICES_DIR) as it:
+        for e in it:
+            if e.is_dir(follow_symlinks=False) and os.path.isfile(os.path.join(e.path, "service.py")):
+                names.append(e.name)
     return sorted(names)
 
 
-def tasks_of(service_name: str) -> list[str]:
-    """Try to import service Plugin to read tasks at build-time (optional)."""
+def _cached_tasks(service_name: str) -> list[str] | None:
+    """Return tasks from the existing manifest if it is newer than service.py."""
+    manifest = PLUGINS_DIR / service_name / "manifest.json"
+    try:
+        if manifest.stat().st_mtime_ns < (SERVICES_DIR / service_name / "service.py").stat().st_mtime_ns:
+            return None
+        t = json.loads(manifest.read_text(encoding="utf-8")).get("tasks")
+    except (OSError, ValueError, AttributeError):
+        return None
+    # an empty list may be a past import failure; retry the import in that case
+    if isinstance(t, list) and t:
+        return [str(x) for x in t]
+    return None
+
+
+def _static_tasks(service_name: str) -> list[str] | None:
+    """Read a literal ``Plugin.tasks`` from service.py without importing it."""
     try:
-        mod = importlib.import_module(f"app.services.{service_name}.service")
+        tree = ast.parse((SERVICES_DIR / service_name / "service.py").read_bytes())
+    except (OSError, SyntaxError, ValueError):
+        return None
+    for node in tree.body:
+        if not (isinstance(node, ast.ClassDef) and node.name == "Plugin"):
+            continue
+        for item in node.body:
+            if isinstance(item, ast.Assign):
+                targets, value = item.targets, item.value
+            elif isinstance(item, ast.AnnAssign) and item.value is not None:
+                targets, value = [item.target], item.value
+            else:
+                continue
+            if any(isinstance(t, ast.Name) and t.id == "tasks" for t in targets):
+                try:
+                    t = ast.literal_eval(value)
+                except (ValueError, TypeError, SyntaxError):
+                    return None  # computed dynamically
+                if isinstance(t, (list, tuple, set)):
+                    return [str(x) for x in t]
+                return None
+    return None
+
+
+@cache
+def tasks_of(service_name: str) -> tuple[str, ...]:
+    """Try to import service Plugin to read tasks at build-time (optional).
+
+    Results (including empty ones for broken services) are memoised for the lifetime of the process.
+    """
+    cached = _cached_tasks(service_name)
+    if cached is not None:
+        return tuple(cached)
+    static = _static_tasks(service_name)
+    if static:
+        return tuple(static)
+    modname = f"app.services.{service_name}.service"
+    try:
+        mod = sys.modules.get(modname) or importlib.import_module(modname)
         PluginCls = getattr(mod, "Plugin", None)
         if PluginCls is None:
-            return []
+            return ()
         t = getattr(PluginCls, "tasks", [])
         if isinstance(t, (list, tuple, set)):
-            return [str(x) for x in t]
+            return tuple(str(x) for x in t)
     except Exception:
         pass
-    return []
+    return ()
 
 
-def write_text(path: Path, text: str) -> None:
+def write_bytes_atomic(path: Path, data: bytes) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
+    # write to a sibling temp file and swap it in so readers never see a partial file
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def write_text(path: Path, text: str) -> None:
     # enforce LF to avoid mixed line endings
-    path.write_text(text.replace("\r\n", "\n"), encoding="utf-8")
+    if "\r\n" in text:
+        text = text.replace("\r\n", "\n")
+    write_bytes_atomic(path, text.encode("utf-8"))
 
 
 def recreate_one(name: str) -> None:
-    tasks = tasks_of(name)  # may be []
+    tasks = list(tasks_of(name))  # may be []
     pdir = PLUGINS_DIR / name
     p_py = pdir / "plugin.py"
     p_init = pdir / "__init__.py"
@@ -99,13 +141,15 @@ def recreate_one(name: str) -> None:
 
     # clean directory (but keep folder)
     if pdir.exists():
-        for f in pdir.iterdir():
-            if f.is_file():
-                f.unlink()
+        with os.scandir(pdir) as it:
+            for e in it:
+                if e.is_file(follow_symlinks=False):
+                    os.unlink(e.path)
     else:
         pdir.mkdir(parents=True, exist_ok=True)
 
-    code = WRAPPER_TEMPLATE.replace("__NAME__", name).replace("__TASKS__", repr(tasks))
+    # json.dumps yields valid (double-quoted) Python literals for str / list[str]
+    code = WRAPPER_TEMPLATE.replace("__NAME__", json.dumps(name)).replace("__TASKS__", json.dumps(tasks))
     write_text(p_py, code)
     write_text(p_init, "")
 
@@ -118,7 +162,7 @@ def recreate_one(name: str) -> None:
         "tasks": tasks,
         "models": [],
     }
-    write_text(manifest, json.dumps(manifest_obj, ensure_ascii=False, indent=2))
+    write_bytes_atomic(manifest, _dump_manifest(manifest_obj))
     print(f"[OK] recreated wrapper: {name} (tasks={tasks or '[]'})")
 
 
@@ -127,8 +171,12 @@ def main() -> None:
     if not names:
         print("[WARN] no services found under app/services/*")
         return
-    for n in names:
-        recreate_one(n)
+    if len(names) == 1:
+        recreate_one(names[0])
+    else:
+        # imports of heavy service modules dominate; spread them over processes
+        with ProcessPoolExecutor(max_workers=min(8, len(names))) as ex:
+            list(ex.map(recreate_one, names))
     print("Recreation complete ✅")
 
 
@@ -1,19 +1,31 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import functools
+import http.client
 import os
 import signal
 import socket
 import subprocess
 import sys
+import threading
 import time
-import urllib.request
+import urllib.parse
 import webbrowser
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
 from pathlib import Path
 from typing import Optional
 
 ROOT = Path(__file__).resolve().parent
 
+# Every child started via spawn(), so shutdown can reach processes whose startup failed midway.
+_CHILDREN: list[subprocess.Popen] = []
+# Set to abort in-flight health checks once startup has failed or been interrupted.
+_STOP = threading.Event()
+# Idle keep-alive health-check connections keyed by (scheme, netloc), shared by all wait_for_health calls.
+_HEALTH_CONNS: dict[tuple[str, str], http.client.HTTPConnection] = {}
+_HEALTH_LOCK = threading.Lock()
+
 def is_windows() -> bool:
     """Check if the operating system is Windows."""
     return os.name == "nt"
@@ -29,35 +41,75 @@ def venv_python(venv_dir: Path) -> Path:
     """
     return venv_dir / ("Scripts/python.exe" if is_windows() else "bin/python")
 
-def wait_for_health(url: str, timeout_s: int = 60, interval_s: float = 1.5) -> None:
+def wait_for_health(url: str, timeout_s: int = 60, interval_s: float = 1.0) -> None:
     """Wait for a service to become healthy by polling its health check URL.
 
+    A single keep-alive connection is reused across polls and only reopened after an error.
+
     Args:
         url (str): The health check URL.
         timeout_s (int): Timeout in seconds.
-        interval_s (float): Polling interval in seconds.
+        interval_s (float): Maximum polling interval in seconds; polling starts at 50 ms and backs off.
 
     Raises:
         RuntimeError: If health check fails within the timeout.
     """
+    parts = urllib.parse.urlsplit(url)
+    key = (parts.scheme, parts.netloc)
+    conn_cls = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+
     start = time.time()
     last_err: Optional[Exception] = None
-    while time.time() - start < timeout_s:
-        try:
-            with urllib.request.urlopen(url, timeout=3) as r:
+    delay = 0.05
+    with _HEALTH_LOCK:
+        conn = _HEALTH_CONNS.pop(key, None)
+    if conn is None:
+        conn = conn_cls(parts.netloc, timeout=3)
+    try:
+        while time.time() - start < timeout_s:
+            if _STOP.is_set():
+                raise RuntimeError(f"Healthcheck cancelled: {url}")
+            try:
+                conn.request("GET", path)
+                r = conn.getresponse()
+                r.read()  # drain so the connection can be reused
                 if r.status == 200:
+                    # hand the live connection back for the next check against this origin
+                    with _HEALTH_LOCK:
+                        if _HEALTH_CONNS.setdefault(key, conn) is conn:
+                            conn = None
                     return
-        except Exception as e:
-            last_err = e
-        time.sleep(interval_s)
+                last_err = RuntimeError(f"HTTP {r.status}")
+            except (OSError, http.client.HTTPException) as e:
+                last_err = e
+                conn.close()
+                conn = conn_cls(parts.netloc, timeout=3)
+            time.sleep(delay)
+            delay = min(interval_s, delay * 1.7)
+    finally:
+        if conn is not None:
+            conn.close()
     raise RuntimeError(f"Healthcheck timed out: {url} (last error: {last_err})")
 
+@functools.lru_cache(maxsize=1)
 def get_local_ip() -> str:
     """Get the local IPv4 address (LAN). Defaults to 127.0.0.1 on failure.
 
+    The result is cached for the lifetime of the process.
+
     Returns:
         str: The local IP address.
     """
+    try:
+        for *_, sockaddr in socket.getaddrinfo(socket.gethostname(), None, socket.AF_INET):
+            if not sockaddr[0].startswith("127."):
+                return sockaddr[0]
+    except OSError:
+        pass
+    # hostname only resolves to loopback: ask the routing table via a connected UDP socket (no packet is sent)
     s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
     try:
         s.connect(("8.8.8.8", 80))
@@ -68,6 +120,25 @@ def get_local_ip() -> str:
         s.close()
     return ip
 
+def spawn(cmd: list[str], cwd: Path, **kwargs) -> subprocess.Popen:
+    """Start a service process and record it in _CHILDREN so shutdown can reach it.
+
+    A thin wrapper around subprocess.Popen. stdout/stderr are inherited rather than piped,
+    so a chatty child writes straight to the console and can never stall on a full pipe
+    buffer that the monitor loop has not drained.
+
+    Args:
+        cmd (list[str]): Command line to execute.
+        cwd (Path): Working directory of the child.
+        **kwargs: Extra keyword arguments forwarded to subprocess.Popen.
+
+    Returns:
+        subprocess.Popen: The started process.
+    """
+    proc = subprocess.Popen(cmd, cwd=str(cwd), **kwargs)
+    _CHILDREN.append(proc)
+    return proc
+
 def start_api() -> subprocess.Popen:
     """Start the FastAPI service using Uvicorn in a subprocess.
 
@@ -92,7 +163,7 @@ def start_api() -> subprocess.Popen:
     ]
 
     print(f"[api] Starting: {' '.join(cmd)} (cwd={fastapi_dir})")
-    proc = subprocess.Popen(cmd, cwd=str(fastapi_dir))
+    proc = spawn(cmd, fastapi_dir, stdin=subprocess.DEVNULL)
 
     urls_to_check = [
         "http://127.0.0.1:8000/health",
@@ -129,7 +200,7 @@ def start_streamlit() -> subprocess.Popen:
         "--server.port", "8501",
     ]
     print(f"[ui] Starting: {' '.join(cmd)} (cwd={ui_dir})")
-    proc = subprocess.Popen(cmd, cwd=str(ui_dir))
+    proc = spawn(cmd, ui_dir)  # keep stdin: streamlit may prompt on first run
 
     loopback_url = "http://127.0.0.1:8501"
     print(f"[ui] Waiting for health @ {loopback_url}")
@@ -169,14 +240,50 @@ def terminate(proc: Optional[subprocess.Popen]) -> None:
     except Exception:
         pass
 
+def watch_children(*procs: subprocess.Popen) -> threading.Event:
+    """Return an event that is set whenever one of the given children may have exited.
+
+    Uses SIGCHLD on POSIX; on Windows a daemon thread blocks in wait() for each process.
+
+    Args:
+        *procs (subprocess.Popen): Processes to watch.
+
+    Returns:
+        threading.Event: Set on child exit; the caller clears it before re-checking.
+    """
+    exited = threading.Event()
+    if is_windows():
+        def _waiter(p: subprocess.Popen) -> None:
+            p.wait()
+            exited.set()
+
+        for p in procs:
+            threading.Thread(target=_waiter, args=(p,), daemon=True).start()
+    else:
+        signal.signal(signal.SIGCHLD, lambda *_: exited.set())
+    return exited
+
 def main() -> None:
     """Main function to start and monitor both API and UI services."""
-    api_proc = ui_proc = None
     try:
-        api_proc = start_api()
-        ui_proc = start_streamlit()
+        # API and UI do not depend on each other: launch and health-check both at once
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="startup") as ex:
+            fut_api = ex.submit(start_api)
+            fut_ui = ex.submit(start_streamlit)
+            try:
+                done, _ = wait([fut_api, fut_ui], return_when=FIRST_EXCEPTION)
+                for fut in done:
+                    fut.result()  # re-raise the first startup failure
+                api_proc, ui_proc = fut_api.result(), fut_ui.result()
+            except BaseException:
+                _STOP.set()
+                raise
         print("All services are up. Press CTRL+C to exit.")
+        exited = watch_children(api_proc, ui_proc)
+        # Windows lock waits are not interruptible by CTRL+C, so wake up periodically there
+        wait_timeout = 1.0 if is_windows() else None
         while True:
+            exited.clear()
             code_api = api_proc.poll()
             code_ui = ui_proc.poll()
             if code_api is not None:
@@ -185,12 +292,17 @@ def main() -> None:
             if code_ui is not None:
                 print(f"[ui] Exited with code {code_ui}")
                 break
-            time.sleep(0.5)
+            exited.wait(wait_timeout)
     except KeyboardInterrupt:
         print("\nCTRL+C received, shutting down...")
     finally:
-        terminate(ui_proc)
-        terminate(api_proc)
+        _STOP.set()
+        for proc in reversed(_CHILDREN):
+            terminate(proc)
+        with _HEALTH_LOCK:
+            for conn in _HEALTH_CONNS.values():
+                conn.close()
+            _HEALTH_CONNS.clear()
 
 if __name__ == "__main__":
     main()
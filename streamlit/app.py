@@ -1,14 +1,36 @@
 # app.py
 from __future__ import annotations
 
+import atexit
+import functools
 import json
+import os
 import re
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Any, Dict, Optional, cast
+from typing import Any, Callable, Dict, Iterable, List, Optional, cast
+from urllib.parse import urlsplit
 
 import requests
 import streamlit as st
+from requests.adapters import HTTPAdapter
+
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+
+    def _dumps_pretty(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+except ImportError:
+    _loads = json.loads
+
+    def _dumps_pretty(obj: Any) -> bytes:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
 
 
 # =========================
@@ -19,25 +41,85 @@ st.set_page_config(page_title="NeuroServe Dashboard", page_icon="🚀", layout="
 APP_DIR = Path(__file__).parent
 STREAMLIT_DIR = APP_DIR / ".streamlit"
 SERVERS_STORE = STREAMLIT_DIR / "servers.json"
+TOKENS_STORE = STREAMLIT_DIR / "tokens.json"
+# tokens.json is one file for the whole Streamlit process, i.e. shared by every browser session.
+# Only use it in explicit single-user/local mode; otherwise tokens live in each session's state only.
+PERSIST_TOKENS = os.getenv("NS_PERSIST_TOKENS") == "1"
 CSS_PATH = STREAMLIT_DIR / "neuroserve.css"
 
 
 # =========================
 # CSS Loader (external file)
 # =========================
-@st.cache_data
-def _load_text(path: str) -> str:
-    return Path(path).read_text(encoding="utf-8")
+@st.cache_resource
+def _css_block(path: str) -> Optional[str]:
+    """Rendered <style> tag, built once per process (None if the file is missing)."""
+    css_file = Path(path)
+    if not css_file.is_file():
+        return None
+    return f"<style>{css_file.read_text(encoding='utf-8')}</style>"
 
 def apply_css(path: Path) -> None:
-    if path.exists():
-        st.markdown(f"<style>{_load_text(str(path))}</style>", unsafe_allow_html=True)
+    block = _css_block(str(path))
+    if block is not None:
+        st.markdown(block, unsafe_allow_html=True)
     else:
         st.warning(f"CSS file not found: {path}")
 
 apply_css(CSS_PATH)
 
 
+# =========================
+# HTTP Sessions (one keep-alive pool per origin, shared across reruns)
+# =========================
+@st.cache_resource
+def _sessions() -> Dict[str, requests.Session]:
+    pool: Dict[str, requests.Session] = {}
+
+    def _close_all() -> None:
+        for sess in list(pool.values()):
+            sess.close()
+
+    atexit.register(_close_all)
+    return pool
+
+_SESSIONS = _sessions()
+
+# Worker count of the leaf-request pool; each origin keeps as many idle keep-alive sockets so
+# a full fan-out to one server never has to discard connections ("Connection pool is full").
+_REQ_WORKERS = 16
+
+def _origin(base_url: str) -> str:
+    parts = urlsplit(base_url.strip())
+    return f"{parts.scheme.lower()}://{parts.netloc.lower()}"
+
+def session_for(base_url: str) -> requests.Session:
+    """Return the pooled Session for base_url's origin, creating it on first use."""
+    key = _origin(base_url)
+    sess = _SESSIONS.get(key)
+    if sess is None:
+        sess = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=_REQ_WORKERS, pool_block=False, max_retries=0)
+        sess.mount("http://", adapter)
+        sess.mount("https://", adapter)
+        sess = _SESSIONS.setdefault(key, sess)
+    return sess
+
+def close_session_for(base_url: str) -> None:
+    sess = _SESSIONS.pop(_origin(base_url), None)
+    if sess is not None:
+        sess.close()
+
+@st.cache_resource
+def _executor(prefix: str, max_workers: int) -> ThreadPoolExecutor:
+    pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=prefix)
+    atexit.register(pool.shutdown, wait=False)
+    return pool
+
+# Leaf requests only; kept apart from the per-server pool so nested waits cannot starve it.
+_REQ_POOL = _executor("ns-req", _REQ_WORKERS)
+
+
 # =========================
 # Storage Helpers
 # =========================
@@ -48,7 +130,7 @@ def load_servers_from_disk() -> Dict[str, str]:
     """Return {} if file missing/invalid (لا قيم افتراضية)."""
     if SERVERS_STORE.exists():
         try:
-            data = json.loads(SERVERS_STORE.read_text(encoding="utf-8"))
+            data = _loads(SERVERS_STORE.read_bytes())
             if isinstance(data, dict):
                 return {str(k): str(v) for k, v in data.items()}
         except Exception:
@@ -57,7 +139,41 @@ def load_servers_from_disk() -> Dict[str, str]:
 
 def save_servers_to_disk(servers: Dict[str, str]) -> None:
     ensure_dirs()
-    SERVERS_STORE.write_text(json.dumps(servers, indent=2, ensure_ascii=False), encoding="utf-8")
+    SERVERS_STORE.write_bytes(_dumps_pretty(servers))
+
+def load_tokens_from_disk() -> Dict[str, Optional[str]]:
+    """Return {base_url: token}; {} if file missing/invalid or NS_PERSIST_TOKENS is off."""
+    if PERSIST_TOKENS and TOKENS_STORE.exists():
+        try:
+            data = _loads(TOKENS_STORE.read_bytes())
+            if isinstance(data, dict):
+                return {str(k): str(v) for k, v in data.items() if v}
+        except Exception:
+            pass
+    return {}
+
+@st.cache_resource
+def _tokens_lock() -> threading.Lock:
+    """Serialises read-merge-write of tokens.json across sessions (all run in this one process)."""
+    return threading.Lock()
+
+def persist_token(base_url: str, token: Optional[str]) -> None:
+    """Merge one server's token into tokens.json (None removes it); no-op unless NS_PERSIST_TOKENS=1."""
+    if not PERSIST_TOKENS:
+        return
+    with _tokens_lock():
+        tokens = load_tokens_from_disk()
+        if token:
+            tokens[base_url] = token
+        else:
+            tokens.pop(base_url, None)
+        ensure_dirs()
+        # write a private temp file and swap it in, so readers never see a truncated file
+        tmp = TOKENS_STORE.with_name(f"{TOKENS_STORE.name}.{os.getpid()}.tmp")
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(_dumps_pretty(tokens))
+        os.replace(tmp, TOKENS_STORE)
 
 
 # =========================
@@ -69,12 +185,16 @@ def _init_state() -> None:
     if "selected_server" not in st.session_state:
         st.session_state.selected_server = ""  # لا اختيار تلقائي
     if "token_by_server" not in st.session_state:
-        st.session_state["token_by_server"] = {}  # {base_url: token or None}
+        st.session_state["token_by_server"] = load_tokens_from_disk()  # {base_url: token or None}
     if "last_response" not in st.session_state:
         st.session_state.last_response = None
 
 _init_state()
 
+# Bound once per rerun; the dict object lives in session_state, so in-place edits persist.
+# setdefault instead of indexing + cast(): no KeyError path, no extra call per rerun.
+TOKENS: Dict[str, Optional[str]] = st.session_state.setdefault("token_by_server", {})
+
 
 # =========================
 # Sidebar Actions (callbacks)
@@ -99,24 +219,55 @@ def _delete_selected_server():
     name = st.session_state.selected_server
     if name in st.session_state.servers:
         base = st.session_state.servers.pop(name)
-        token_map = cast(Dict[str, Optional[str]], st.session_state["token_by_server"])
-        token_map.pop(base, None)
+        if TOKENS.pop(base, None):
+            persist_token(base, None)
+        # free the pooled sockets unless another server shares the same origin
+        if _origin(base) not in {_origin(u) for u in st.session_state.servers.values()}:
+            close_session_for(base)
         st.session_state.selected_server = next(iter(st.session_state.servers)) if st.session_state.servers else ""
         save_servers_to_disk(st.session_state.servers)
         st.success(f"Deleted '{name}'")
 
+@st.cache_resource
+def _no_head_origins() -> set:
+    """Origins that answered HEAD with 405/501 (FastAPI does for GET-only routes); probed with GET."""
+    return set()
+
+# Bound on the script thread: probe workers use the plain set, never the cache_resource getter.
+_NO_HEAD = _no_head_origins()
+
+_PROBE_TIMEOUT = (2, 3)  # (connect, read): unreachable hosts fail fast
+
 def _test_connection(base_url: str) -> tuple[bool, float, str]:
-    """يرجع (ok, latency_ms, message). يجرب GET /health ثم /"""
+    """يرجع (ok, latency_ms, message). يجرب /health ثم / (HEAD أولاً ثم GET)"""
     if not base_url:
         return (False, 0.0, "Empty URL")
     base = base_url.rstrip("/")
+    sess = session_for(base)
+    origin = _origin(base)
+    no_head = _NO_HEAD
     start = time.perf_counter()
+
+    def _probe(path: str) -> tuple[requests.Response, float]:
+        url = f"{base}{path}"
+        r: Optional[requests.Response] = None
+        if origin not in no_head:
+            r = sess.head(url, timeout=_PROBE_TIMEOUT, allow_redirects=False)
+            if r.status_code in (405, 501):
+                no_head.add(origin)
+                r = None
+        if r is None:
+            r = sess.get(url, timeout=_PROBE_TIMEOUT, allow_redirects=False)
+        return r, (time.perf_counter() - start) * 1000
+
+    # fire both probes at once; /health still wins whenever it answers
+    futures = [(path, _REQ_POOL.submit(_probe, path)) for path in ("/health", "/")]
     try:
-        for path in ("/health", "/"):
+        for path, fut in futures:
             try:
-                r = requests.get(f"{base}{path}", timeout=5)
-                dt = (time.perf_counter() - start) * 1000
-                return (r.ok, dt, f"{path} → {r.status_code}")
+                r, dt = fut.result()
+                # redirects aren't followed, so only a 2xx counts: a 302 to a login page isn't "healthy"
+                return (200 <= r.status_code < 300, dt, f"{path} → {r.status_code}")
             except requests.RequestException:
                 continue
         dt = (time.perf_counter() - start) * 1000
@@ -129,67 +280,171 @@ def _test_connection(base_url: str) -> tuple[bool, float, str]:
 # =========================
 # OpenAPI Capability Detection
 # =========================
-@st.cache_data(ttl=60)
+@st.cache_resource
+def _openapi_cache() -> Dict[str, tuple[Optional[str], Optional[str], dict]]:
+    """{base_url: (etag, last_modified, parsed_openapi)} shared across reruns and probe threads."""
+    return {}
+
+_OPENAPI_CACHE = _openapi_cache()  # bound here so fetch_openapi() is safe on worker threads
+
+_HTTP_METHODS = ("get", "post", "put", "delete", "patch")
+
+def _slim_openapi(doc: Any) -> dict:
+    """Keep only {"paths": {path: {method: True}}}: all build_caps/features_for ever read."""
+    paths = doc.get("paths") if isinstance(doc, dict) else None
+    if not isinstance(paths, dict):
+        return {"paths": {}}
+    return {
+        "paths": {
+            pth: {m: True for m in _HTTP_METHODS if item.get(m)}
+            for pth, item in paths.items()
+            if isinstance(item, dict)
+        }
+    }
+
 def fetch_openapi(base_url: str) -> Optional[dict]:
-    """يحاول قراءة /openapi.json؛ يرجع None لو فشل."""
+    """يحاول قراءة /openapi.json؛ يرجع None لو فشل. يعيد التحقق عبر ETag / Last-Modified.
+
+    Only the paths/methods skeleton is returned (see _slim_openapi).
+    """
     if not base_url:
         return None
     base = base_url.rstrip("/")
+    cache = _OPENAPI_CACHE
+    entry = cache.get(base)
+    headers: Dict[str, str] = {}
+    if entry:
+        etag, last_modified, _ = entry
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
     try:
-        r = requests.get(f"{base}/openapi.json", timeout=6)
+        r = session_for(base).get(f"{base}/openapi.json", headers=headers, timeout=6)
+        if r.status_code == 304 and entry:
+            return entry[2]
         if r.ok:
-            return r.json()
+            data = _slim_openapi(_loads(r.content))  # drop components/schemas before caching
+            etag, last_modified = r.headers.get("ETag"), r.headers.get("Last-Modified")
+            if etag or last_modified:
+                cache[base] = (etag, last_modified, data)
+            else:
+                cache.pop(base, None)
+            return data
     except Exception:
         pass
     return None
 
+_TEMPLATE_VAR_RE = re.compile(r"\\\{[^/]+?\\\}")
+
+def _template_pattern(template: str) -> str:
+    """حوّل /plugins/{name}/{task} إلى نمط يطابق /plugins/xxx/yyy"""
+    return _TEMPLATE_VAR_RE.sub(r"[^/]+", re.escape(template))
+
+@functools.lru_cache(maxsize=1024)
 def _path_to_regex(template: str) -> re.Pattern:
-    """حوّل /plugins/{name}/{task} إلى Regex يطابق /plugins/xxx/yyy"""
-    esc = re.escape(template)
-    pattern = re.sub(r"\\{[^/]+?\\}", r"[^/]+", esc)
-    return re.compile("^" + pattern + "$")
-
-def build_caps(openapi: Optional[dict]) -> Dict[str, set]:
-    """يرجّع { 'GET': {paths...}, ... }"""
-    caps: Dict[str, set] = {"GET": set(), "POST": set(), "PUT": set(), "DELETE": set(), "PATCH": set()}
-    if not openapi or "paths" not in openapi:
-        return caps
-    for pth, item in openapi["paths"].items():
-        for method in list(caps.keys()):
-            if item.get(method.lower()):
-                caps[method].add(pth)
+    """Compiled, anchored matcher for one path template (shared across servers and reruns)."""
+    return re.compile("^" + _template_pattern(template) + "$")
+
+# {method: (literal paths, one compiled alternation of all templated paths or None)}
+Caps = Dict[str, tuple[frozenset, Optional[re.Pattern]]]
+
+def build_caps(openapi: Optional[dict]) -> Caps:
+    """يرجّع { 'GET': (frozenset({paths...}), regex|None), ... }"""
+    paths: Dict[str, set] = {"GET": set(), "POST": set(), "PUT": set(), "DELETE": set(), "PATCH": set()}
+    if openapi and "paths" in openapi:
+        for pth, item in openapi["paths"].items():
+            for method in paths:
+                if item.get(method.lower()):
+                    paths[method].add(pth)
+    caps: Caps = {}
+    for method, found in paths.items():
+        templated = sorted(p for p in found if "{" in p and "}" in p)
+        regex = re.compile("^(?:" + "|".join(_template_pattern(t) for t in templated) + ")$") if templated else None
+        caps[method] = (frozenset(found), regex)
     return caps
 
-@st.cache_data(ttl=60)
-def get_caps_for(base_url: str) -> Dict[str, set]:
+@st.cache_resource(ttl=60)
+def get_caps_for(base_url: str) -> Caps:
+    # cache_resource hands back the same object (no per-call unpickle / regex recompile); treat it as read-only
     return build_caps(fetch_openapi(base_url))
 
-def supports(base_url: str, method: str, path: str) -> bool:
-    """يتحقق هل الـ endpoint مدعوم بناءً على OpenAPI (مع مطابقة المتغيّرات)."""
-    caps = get_caps_for(base_url)
-    method = method.upper()
-    if method not in caps:
+def _caps_support(caps: Caps, method: str, path: str) -> bool:
+    entry = caps.get(method.upper())
+    if entry is None:
         return False
+    literals, regex = entry
     wanted = "/" + path.strip("/")
-    if wanted in caps[method]:
-        return True
-    for tpl in caps[method]:
-        if "{" in tpl and "}" in tpl:
-            if _path_to_regex(tpl).match(wanted):
-                return True
-    return False
+    return wanted in literals or (regex is not None and regex.match(wanted) is not None)
 
+def supports(base_url: str, method: str, path: str) -> bool:
+    """يتحقق هل الـ endpoint مدعوم بناءً على OpenAPI (مع مطابقة المتغيّرات)."""
+    return _caps_support(get_caps_for(base_url), method, path)
+
+# endpoints every NeuroServe FastAPI app serves (app/main.py): no capability lookup needed
+_ALWAYS_OK = frozenset({("GET", "/"), ("GET", "/health")})
+
+# feature -> (combinator, endpoints); evaluated in one pass over the OpenAPI paths
+_FEATURE_RULES: Dict[str, tuple[Callable[[Iterable[bool]], bool], tuple[tuple[str, str], ...]]] = {
+    "auth":      (any, (("POST", "/auth/login"),)),
+    "auth_me":   (any, (("GET", "/auth/me"),)),
+    "uploads":   (any, (("GET", "/uploads/pdf"), ("POST", "/uploads/pdf"))),
+    "plugins":   (all, (("GET", "/plugins"), ("POST", "/plugins/{name}/{task}"))),
+    "inference": (any, (("POST", "/inference"),)),
+    "workflows": (any, (("GET", "/workflows"), ("POST", "/workflows/run"))),
+    "root":      (any, (("GET", "/"), ("GET", "/docs"), ("GET", "/redoc"))),
+}
+_FEATURE_ENDPOINTS = frozenset(ep for _, eps in _FEATURE_RULES.values() for ep in eps)
+
+def _features_from_openapi(openapi: Optional[dict]) -> Dict[str, bool]:
+    """Feature flags from a (slim) OpenAPI document; plain function, safe on worker threads."""
+    openapi = openapi or {}
+    hit: set = set()
+    for pth, item in (openapi.get("paths") or {}).items():
+        regex = _path_to_regex(pth) if "{" in pth and "}" in pth else None
+        for method, probe in _FEATURE_ENDPOINTS:
+            if (method, probe) in hit or not item.get(method.lower()):
+                continue
+            if probe == pth or (regex is not None and regex.match(probe)):
+                hit.add((method, probe))
+    return {name: combine(ep in hit for ep in eps) for name, (combine, eps) in _FEATURE_RULES.items()}
+
+# long TTL: the sidebar "Refresh capabilities" button clears it explicitly
+@st.cache_data(ttl=300, show_spinner=False)
 def features_for(base_url: str) -> Dict[str, bool]:
     """يستنتج دعم التبويبات الأساسية لهذا السيرفر."""
-    return {
-        "auth":      supports(base_url, "POST", "/auth/login"),
-        "auth_me":   supports(base_url, "GET",  "/auth/me"),
-        "uploads": supports(base_url, "GET", "/uploads/pdf") or supports(base_url, "POST", "/uploads/pdf"),
-        "plugins":   supports(base_url, "GET",  "/plugins") and supports(base_url, "POST", "/plugins/{name}/{task}"),
-        "inference": supports(base_url, "POST", "/inference"),
-        "workflows": supports(base_url, "GET",  "/workflows") or supports(base_url, "POST", "/workflows/run"),
-        "root":      supports(base_url, "GET",  "/") or supports(base_url, "GET", "/docs") or supports(base_url, "GET", "/redoc"),
-    }
+    return _features_from_openapi(fetch_openapi(base_url))
+
+def current_features(base_url: str) -> Dict[str, bool]:
+    """features_for(base_url), recomputed only when the selected server changes (or after a refresh)."""
+    if st.session_state.get("_feats_base") != base_url:
+        st.session_state["_feats"] = features_for(base_url) if base_url else {}
+        st.session_state["_feats_base"] = base_url
+    return st.session_state["_feats"]
+
+def _refresh_caps() -> None:
+    features_for.clear()
+    get_caps_for.clear()
+    st.session_state.pop("_feats_base", None)
+
+# =========================
+# Parallel probes (independent I/O per server)
+# =========================
+# Workers run without a ScriptRunContext: only plain functions go here, never st.cache_* ones.
+_POOL = _executor("ns-probe", 8)
+
+def _map_servers(fn: Callable[[str], Any], base_urls: Iterable[str]) -> Dict[str, Any]:
+    futures = {_POOL.submit(fn, base): base for base in dict.fromkeys(base_urls) if base}
+    return {futures[f]: f.result() for f in as_completed(futures)}
+
+def features_for_many(base_urls: Iterable[str]) -> Dict[str, Dict[str, bool]]:
+    """Feature flags for several servers at once; wall time ≈ the slowest server."""
+    docs = _map_servers(fetch_openapi, base_urls)
+    return {base: _features_from_openapi(doc) for base, doc in docs.items()}
+
+def test_connections(base_urls: Iterable[str]) -> Dict[str, tuple[bool, float, str]]:
+    """_test_connection() for several servers at once."""
+    return _map_servers(_test_connection, base_urls)
 
 
 # =========================
@@ -260,6 +515,20 @@ with st.sidebar:
     if del_clicked:
         _delete_selected_server()
 
+    if has_servers and st.button("🧪 Test all servers", key="svr-test-all", use_container_width=True):
+        servers_snapshot = dict(st.session_state.servers)
+        results = test_connections(servers_snapshot.values())
+        feats_all = features_for_many(servers_snapshot.values())
+        for svr_name, svr_base in servers_snapshot.items():
+            ok, ms, msg = results.get(svr_base, (False, 0.0, "Empty URL"))
+            n_feats = sum(1 for k, v in feats_all.get(svr_base, {}).items() if v and k != "auth_me")
+            st.markdown(
+                f'<span class="ns-dot {"ok" if ok else "fail"}"></span>'
+                f"<b>{svr_name}</b> "
+                f'<span class="ns-latency">({ms:.0f} ms) · {msg} · {n_feats} features</span>',
+                unsafe_allow_html=True,
+            )
+
     if reload_clicked:
         st.session_state.servers = load_servers_from_disk()
         names = list(st.session_state.servers.keys())
@@ -272,11 +541,11 @@ with st.sidebar:
     st.markdown('<div class="ns-card">', unsafe_allow_html=True)
     if st.session_state.selected_server and st.session_state.selected_server in st.session_state.servers:
         current_base_sb = st.session_state.servers[st.session_state.selected_server]
-        token_map = cast(Dict[str, Optional[str]], st.session_state["token_by_server"])
-        if token_map.get(current_base_sb):
+        if TOKENS.get(current_base_sb):
             st.markdown('<span class="ns-chip">🔐 Token exists for this server</span>', unsafe_allow_html=True)
             def _logout():
-                token_map[current_base_sb] = None
+                TOKENS[current_base_sb] = None
+                persist_token(current_base_sb, None)
                 st.success("Token cleared.")
             st.button("Logout (Delete Token)", key="svr-logout", use_container_width=True, on_click=_logout)
         else:
@@ -288,7 +557,7 @@ with st.sidebar:
     # Capabilities badges
     if st.session_state.selected_server and st.session_state.selected_server in st.session_state.servers:
         base_for_badges = st.session_state.servers[st.session_state.selected_server]
-        feats = features_for(base_for_badges)
+        feats = current_features(base_for_badges)
         label_map = {
             "auth":"Auth", "uploads":"Uploads", "plugins":"Plugins",
             "inference":"Inference", "workflows":"Workflows", "root":"Health/Docs"
@@ -299,6 +568,7 @@ with st.sidebar:
             dot = '<span class="ns-dot ok"></span>' if ok else '<span class="ns-dot fail"></span>'
             chips.append(f'<span class="ns-chip">{dot}{lbl}</span>')
         st.markdown('<div class="ns-card">' + " ".join(chips) + "</div>", unsafe_allow_html=True)
+        st.button("🔄 Refresh capabilities", key="svr-refresh-caps", use_container_width=True, on_click=_refresh_caps)
 
 # Disable actions when no server selected
 no_selection = (not st.session_state.selected_server) or (
@@ -306,39 +576,29 @@ no_selection = (not st.session_state.selected_server) or (
 )
 
 current_base = st.session_state.servers.get(st.session_state.selected_server, "") if not no_selection else ""
-current_feats = features_for(current_base) if current_base else {}
+current_feats = current_features(current_base)
 
 
 # =========================
 # HTTP Helpers
 # =========================
-def api_request(
+def send_request(
     method: str,
+    base_url: str,
     path: str,
     *,
     params: Optional[Dict[str, Any]] = None,
     json_body: Optional[Dict[str, Any]] = None,
     files: Optional[Dict[str, Any]] = None,
-    require_auth: bool = False,
-    base_url: Optional[str] = None,
+    token: Optional[str] = None,
 ) -> requests.Response:
-    """Send a request to the selected or given server with optional token authentication."""
-    if not base_url:
-        if no_selection:
-            st.error("No server selected. Add/select a server from the sidebar first.")
-            raise RuntimeError("No server selected")
-        base_url = st.session_state.servers[st.session_state.selected_server]
-
+    """Plain HTTP call on the origin's pooled session; touches no Streamlit state (safe in worker threads)."""
     base = base_url.rstrip("/")
     url = f"{base}/{path.lstrip('/')}"
     headers = {"Accept": "application/json"}
-
-    token_map = cast(Dict[str, Optional[str]], st.session_state["token_by_server"])
-    token = token_map.get(base)
-    if require_auth and token:
+    if token:
         headers["Authorization"] = f"Bearer {token}"
-
-    resp = requests.request(
+    return session_for(base).request(
         method.upper(),
         url,
         params=params,
@@ -347,17 +607,54 @@ def api_request(
         headers=headers,
         timeout=60,
     )
+
+def api_request(
+    method: str,
+    path: str,
+    *,
+    params: Optional[Dict[str, Any]] = None,
+    json_body: Optional[Dict[str, Any]] = None,
+    files: Optional[Dict[str, Any]] = None,
+    require_auth: bool = False,
+    base_url: Optional[str] = None,
+) -> requests.Response:
+    """Send a request to the selected or given server with optional token authentication."""
+    if not base_url:
+        if no_selection:
+            st.error("No server selected. Add/select a server from the sidebar first.")
+            raise RuntimeError("No server selected")
+        base_url = current_base
+
+    token = TOKENS.get(base_url.rstrip("/")) if require_auth else None
+    resp = send_request(method, base_url, path, params=params, json_body=json_body, files=files, token=token)
     st.session_state.last_response = resp
     return resp
 
-def show_response(resp: requests.Response) -> None:
+# bodies above this size get a preview + download button instead of being rendered inline
+_INLINE_BODY_MAX = 64 * 1024
+
+def show_response(resp: requests.Response, *, key: str) -> None:
+    """Render status, body and headers; `key` must be unique per call site within a rerun."""
     col1, col2 = st.columns([2, 1])
     with col1:
         st.markdown(f"**Status:** `{resp.status_code}`")
-        try:
-            st.json(resp.json())
-        except Exception:
-            st.code(resp.text or "<no body>")
+        body_len = len(resp.content)
+        if body_len > _INLINE_BODY_MAX:
+            st.caption(f"Body is {body_len:,} bytes; showing the first 2 KB.")
+            st.code(resp.text[:2048] + "…")
+            st.download_button(
+                "⬇️ Download full response",
+                data=resp.content,
+                file_name="response.bin",
+                mime=resp.headers.get("content-type", "application/octet-stream"),
+                key=f"{key}-download",
+                on_click="ignore",
+            )
+        else:
+            try:
+                st.json(resp.json())
+            except Exception:
+                st.code(resp.text or "<no body>")
     with col2:
         st.markdown("**Headers:**")
         try:
@@ -375,11 +672,18 @@ def safe_json_input(
     txt = st.text_area(label, value=default_text, height=180, key=key)
     if not txt.strip():
         return None
-    try:
-        return json.loads(txt)
-    except json.JSONDecodeError as e:
-        st.error(f"Invalid JSON: {e}")
-        return None
+    # re-parse only when this widget's text changed since the last rerun
+    memo = cast(Dict[Any, tuple], st.session_state.setdefault("_json_inputs", {}))
+    hit = memo.get(key or label)
+    if hit is None or hit[0] != txt:
+        try:
+            hit = (txt, json.loads(txt), None)
+        except json.JSONDecodeError as e:
+            hit = (txt, None, f"Invalid JSON: {e}")
+        memo[key or label] = hit
+    if hit[2]:
+        st.error(hit[2])
+    return hit[1]
 
 
 # =========================
@@ -396,174 +700,205 @@ tabs = st.tabs(["Auth", "Uploads", "Plugins", "Inference", "Workflows", "Health/
 # --- Auth ---
 with tabs[0]:
     st.subheader("Login")
-    auth_disabled = no_selection or not current_feats.get("auth", False)
-    me_disabled   = no_selection or not current_feats.get("auth_me", False)
-
-    c1, _ = st.columns(2)
-    with c1:
-        username = st.text_input("Username", value="", disabled=auth_disabled, key="auth-username")
-        password = st.text_input("Password", value="", type="password", disabled=auth_disabled, key="auth-password")
-        if st.button("POST /auth/login (selected server)", disabled=auth_disabled, key="auth-login"):
-            body = {"username": username, "password": password}
-            resp = api_request("POST", "/auth/login", json_body=body)
-            if resp.ok:
-                try:
-                    data = resp.json()
-                    token = data.get("access_token")
-                    if token and not no_selection:
-                        base = st.session_state.servers[st.session_state.selected_server]
-                        token_map = cast(Dict[str, Optional[str]], st.session_state["token_by_server"])
-                        token_map[base] = token
-                        st.success("Login successful ✅")
-                except Exception:
-                    st.warning("Request succeeded but JSON parsing failed.")
-            show_response(resp)
-
-    if not current_feats.get("auth", True) and not no_selection:
-        st.info("This server does not expose /auth/login")
-
-    st.markdown("---")
-    st.subheader("GET /auth/me (requires Token)")
-    if st.button("GET /auth/me", disabled=me_disabled, key="auth-me"):
-        resp = api_request("GET", "/auth/me", require_auth=True)
-        show_response(resp)
-    if not current_feats.get("auth_me", True) and not no_selection:
-        st.info("This server does not expose /auth/me")
+    if no_selection:
+        st.info("Select a server in the sidebar to enable this tab.")
+    else:
+        has_auth = current_feats.get("auth", False)
+        has_me   = current_feats.get("auth_me", False)
+
+        c1, _ = st.columns(2)
+        with c1:
+            # one rerun per submission instead of one per field edit
+            with st.form("auth-login-form", clear_on_submit=False):
+                username = st.text_input("Username", value="", disabled=not has_auth, key="auth-username")
+                password = st.text_input(
+                    "Password", value="", type="password", disabled=not has_auth, key="auth-password"
+                )
+                login_clicked = st.form_submit_button("POST /auth/login (selected server)", disabled=not has_auth)
+            if login_clicked:
+                body = {"username": username, "password": password}
+                resp = api_request("POST", "/auth/login", json_body=body)
+                if resp.ok:
+                    try:
+                        data = resp.json()
+                        token = data.get("access_token")
+                        if token:
+                            TOKENS[current_base] = token
+                            persist_token(current_base, token)
+                            st.success("Login successful ✅")
+                    except Exception:
+                        st.warning("Request succeeded but JSON parsing failed.")
+                show_response(resp, key="auth-login")
+
+        if not has_auth:
+            st.info("This server does not expose /auth/login")
+
+        st.markdown("---")
+        st.subheader("GET /auth/me (requires Token)")
+        if st.button("GET /auth/me", disabled=not has_me, key="auth-me"):
+            resp = api_request("GET", "/auth/me", require_auth=True)
+            show_response(resp, key="auth-me")
+        if not has_me:
+            st.info("This server does not expose /auth/me")
 
 # --- Uploads ---
 with tabs[1]:
     st.subheader("Uploads")
-    uploads_disabled = no_selection or not current_feats.get("uploads", False)
-
-    # رفع ملف PDF
-    file = st.file_uploader("Choose a PDF file", type=["pdf"], disabled=uploads_disabled, key="upl-file")
-    if file is not None:
-        files = {"file": (file.name, file.getvalue())}
-        if st.button("POST /uploads/pdf", disabled=uploads_disabled, key="upl-post"):
-            resp = api_request("POST", "/uploads/pdf", files=files)
-            show_response(resp)
-
-    st.markdown("---")
-
-    # قائمة الملفات
-    if st.button("GET /uploads/pdf", disabled=uploads_disabled, key="upl-get"):
-        resp = api_request("GET", "/uploads/pdf")
-        if resp.ok:
-            data = resp.json()
-            st.json(data)
-
-            # أزرار تحميل الملفات
-            for f in data.get("files", []):
-                rel_path = f.get("rel_path", "")
-                fname = rel_path.split("/")[-1]
-
-                col1, col2 = st.columns([3, 1])
-                with col1:
-                    st.write(f"- {fname} ({f.get('size_bytes', 0)} bytes)")
-                with col2:
-                    dl = api_request("GET", f"/uploads/pdf/{fname}")
-                    if dl.ok:
-                        st.download_button(
-                            "⬇️ Download",
-                            data=dl.content,
-                            file_name=fname,
-                            mime="application/pdf",
-                            key=f"dl-{fname}",
-                        )
-        else:
-            show_response(resp)
-
-    if not current_feats.get("uploads", True) and not no_selection:
-        st.info("This server does not expose /uploads/pdf")
+    if no_selection:
+        st.info("Select a server in the sidebar to enable this tab.")
+    else:
+        has_uploads = current_feats.get("uploads", False)
+
+        # رفع ملف PDF
+        file = st.file_uploader("Choose a PDF file", type=["pdf"], disabled=not has_uploads, key="upl-file")
+        if file is not None:
+            if st.button("POST /uploads/pdf", disabled=not has_uploads, key="upl-post"):
+                # hand requests the UploadedFile itself (built only on click, no extra bytes copy per rerun)
+                file.seek(0)
+                files = {"file": (file.name, file, file.type or "application/pdf")}
+                resp = api_request("POST", "/uploads/pdf", files=files)
+                show_response(resp, key="upl-post")
+
+        st.markdown("---")
+
+        # قائمة الملفات
+        if st.button("GET /uploads/pdf", disabled=not has_uploads, key="upl-get"):
+            resp = api_request("GET", "/uploads/pdf")
+            if resp.ok:
+                data = resp.json()
+                st.json(data)
+
+                # أزرار تحميل الملفات
+                for f in data.get("files", []):
+                    rel_path = f.get("rel_path", "")
+                    fname = rel_path.split("/")[-1]
+
+                    col1, col2 = st.columns([3, 1])
+                    with col1:
+                        st.write(f"- {fname} ({f.get('size_bytes', 0)} bytes)")
+                    with col2:
+                        dl = api_request("GET", f"/uploads/pdf/{fname}")
+                        if dl.ok:
+                            st.download_button(
+                                "⬇️ Download",
+                                data=dl.content,
+                                file_name=fname,
+                                mime="application/pdf",
+                                key=f"dl-{fname}",
+                            )
+            else:
+                show_response(resp, key="upl-get")
+
+        if not has_uploads:
+            st.info("This server does not expose /uploads/pdf")
 
 
 # --- Plugins ---
 with tabs[2]:
     st.subheader("Plugins")
-    plugins_disabled = no_selection or not current_feats.get("plugins", False)
-
-    if st.button("GET /plugins", disabled=plugins_disabled, key="pl-list"):
-        resp = api_request("GET", "/plugins")
-        show_response(resp)
-
-    st.markdown("---")
-    st.subheader("Run Plugin Task")
-    name = st.text_input("Plugin name", value="pdf_reader", disabled=plugins_disabled, key="pl-name")
-    task = st.text_input("Task", value="extract_text", disabled=plugins_disabled, key="pl-task")
-    payload = safe_json_input("Payload (JSON)", {"rel_path": "pdf/sample.pdf", "return_text": True}, key="pl-payload")
-    if st.button("POST /plugins/{name}/{task}", disabled=plugins_disabled or payload is None, key="pl-run"):
-        path = f"/plugins/{name}/{task}"
-        resp = api_request("POST", path, json_body=payload or {})
-        show_response(resp)
+    if no_selection:
+        st.info("Select a server in the sidebar to enable this tab.")
+    else:
+        has_plugins = current_feats.get("plugins", False)
+
+        if st.button("GET /plugins", disabled=not has_plugins, key="pl-list"):
+            resp = api_request("GET", "/plugins")
+            show_response(resp, key="pl-list")
+
+        st.markdown("---")
+        st.subheader("Run Plugin Task")
+        with st.form("pl-run-form", clear_on_submit=False):
+            name = st.text_input("Plugin name", value="pdf_reader", disabled=not has_plugins, key="pl-name")
+            task = st.text_input("Task", value="extract_text", disabled=not has_plugins, key="pl-task")
+            payload = safe_json_input(
+                "Payload (JSON)", {"rel_path": "pdf/sample.pdf", "return_text": True}, key="pl-payload"
+            )
+            run_clicked = st.form_submit_button("POST /plugins/{name}/{task}", disabled=not has_plugins)
+        if run_clicked and payload is not None:
+            path = f"/plugins/{name}/{task}"
+            resp = api_request("POST", path, json_body=payload or {})
+            show_response(resp, key="pl-run")
 
-    if not current_feats.get("plugins", True) and not no_selection:
-        st.info("This server does not expose /plugins endpoints")
+        if not has_plugins:
+            st.info("This server does not expose /plugins endpoints")
 
 # --- Inference ---
 with tabs[3]:
     st.subheader("Inference (Unified)")
-    inference_disabled = no_selection or not current_feats.get("inference", False)
+    if no_selection:
+        st.info("Select a server in the sidebar to enable this tab.")
+    else:
+        has_inference = current_feats.get("inference", False)
 
-    plugin = st.text_input("Plugin", value="pdf_reader", disabled=inference_disabled, key="inf-plugin")
-    task = st.text_input("Task", value="extract_text", disabled=inference_disabled, key="inf-task")
-    payload = safe_json_input("Payload (JSON)", {"rel_path": "pdf/sample.pdf", "return_text": True}, key="inf-payload")
-    if st.button("POST /inference", disabled=inference_disabled or payload is None, key="inf-run"):
-        body = {"plugin": plugin, "task": task, "payload": payload or {}}
-        resp = api_request("POST", "/inference", json_body=body)
-        show_response(resp)
+        with st.form("inf-run-form", clear_on_submit=False):
+            plugin = st.text_input("Plugin", value="pdf_reader", disabled=not has_inference, key="inf-plugin")
+            task = st.text_input("Task", value="extract_text", disabled=not has_inference, key="inf-task")
+            payload = safe_json_input(
+                "Payload (JSON)", {"rel_path": "pdf/sample.pdf", "return_text": True}, key="inf-payload"
+            )
+            run_clicked = st.form_submit_button("POST /inference", disabled=not has_inference)
+        if run_clicked and payload is not None:
+            body = {"plugin": plugin, "task": task, "payload": payload or {}}
+            resp = api_request("POST", "/inference", json_body=body)
+            show_response(resp, key="inf-run")
 
-    if not current_feats.get("inference", True) and not no_selection:
-        st.info("This server does not expose /inference")
+        if not has_inference:
+            st.info("This server does not expose /inference")
 
 # --- Workflows ---
 with tabs[4]:
     st.subheader("Workflows")
-    wf_disabled = no_selection or not current_feats.get("workflows", False)
+    if no_selection:
+        st.info("Select a server in the sidebar to enable this tab.")
+    else:
+        has_workflows = current_feats.get("workflows", False)
 
-    wf_name = st.text_input("Workflow name", value="asr_clean_ar", disabled=wf_disabled, key="wf-name")
-    wf_inputs = safe_json_input("Inputs (JSON)", {"text": "Hello", "lang": "ar"}, key="wf-inputs")
-    if st.button("POST /workflows/run", disabled=wf_disabled or wf_inputs is None, key="wf-run"):
-        body = {"name": wf_name, "inputs": wf_inputs or {}}
-        resp = api_request("POST", "/workflows/run", json_body=body)
-        show_response(resp)
+        with st.form("wf-run-form", clear_on_submit=False):
+            wf_name = st.text_input("Workflow name", value="asr_clean_ar", disabled=not has_workflows, key="wf-name")
+            wf_inputs = safe_json_input("Inputs (JSON)", {"text": "Hello", "lang": "ar"}, key="wf-inputs")
+            run_clicked = st.form_submit_button("POST /workflows/run", disabled=not has_workflows)
+        if run_clicked and wf_inputs is not None:
+            body = {"name": wf_name, "inputs": wf_inputs or {}}
+            resp = api_request("POST", "/workflows/run", json_body=body)
+            show_response(resp, key="wf-run")
 
-    st.markdown("---")
-    if st.button("GET /workflows", disabled=wf_disabled, key="wf-list"):
-        resp = api_request("GET", "/workflows")
-        show_response(resp)
+        st.markdown("---")
+        if st.button("GET /workflows", disabled=not has_workflows, key="wf-list"):
+            resp = api_request("GET", "/workflows")
+            show_response(resp, key="wf-list")
 
-    if not current_feats.get("workflows", True) and not no_selection:
-        st.info("This server does not expose /workflows")
+        if not has_workflows:
+            st.info("This server does not expose /workflows")
 
 # --- Health/Info ---
 with tabs[5]:
     st.subheader("Health / Docs")
-    health_disabled = no_selection or not current_feats.get("root", False)
-
-    c1, c2, c3 = st.columns(3)
-    with c1:
-        if st.button("GET /", disabled=health_disabled, key="hi-root"):
-            resp = api_request("GET", "/")
-            show_response(resp)
-    with c2:
-        if st.button("GET /docs", disabled=health_disabled, key="hi-docs"):
-            resp = api_request("GET", "/docs")
-            st.write(resp.status_code)
-            st.info("Open /docs in browser to view Swagger.")
-    with c3:
-        if st.button("GET /redoc", disabled=health_disabled, key="hi-redoc"):
-            resp = api_request("GET", "/redoc")
-            st.write(resp.status_code)
-            st.info("Open /redoc in browser to view ReDoc.")
-
-    if not current_feats.get("root", True) and not no_selection:
-        st.info("This server does not expose root/docs endpoints")
-
-    st.markdown("### Last Response (Debug)")
-    if st.session_state.last_response is not None:
-        show_response(st.session_state.last_response)
+    if no_selection:
+        st.info("Select a server in the sidebar to enable this tab.")
     else:
-        st.caption("No response saved yet.")
+        has_root = current_feats.get("root", False)
+
+        c1, c2, c3 = st.columns(3)
+        with c1:
+            if st.button("GET /", disabled=not has_root, key="hi-root"):
+                resp = api_request("GET", "/")
+                show_response(resp, key="hi-root")
+        # Swagger/ReDoc are HTML pages for the browser: link to them instead of downloading them here
+        site = current_base.rstrip("/")
+        with c2:
+            st.link_button("Open /docs", f"{site}/docs", disabled=not has_root)
+        with c3:
+            st.link_button("Open /redoc", f"{site}/redoc", disabled=not has_root)
+
+        if not has_root:
+            st.info("This server does not expose root/docs endpoints")
+
+        # collapsed by default: large payloads are not rendered until the panel is opened
+        with st.expander("Last Response (Debug)", expanded=False):
+            if st.session_state.last_response is not None:
+                show_response(st.session_state.last_response, key="hi-debug")
+            else:
+                st.caption("No response saved yet.")
 
 # --- Broadcast to All Servers ---
 with tabs[6]:
@@ -571,22 +906,69 @@ with tabs[6]:
     req_path = st.text_input("Path", value="/info", key="bc-path")
     method = st.selectbox("Method", ["GET", "POST", "PUT", "DELETE"], index=0, key="bc-method")
     body = safe_json_input("Body (JSON) — Optional", {}, key="bc-body")
+    max_conc = st.slider("Max parallel requests", 1, _REQ_WORKERS, min(8, _REQ_WORKERS), key="bc-conc")
     if st.button("Send to all", key="bc-send"):
         if not st.session_state.servers:
             st.warning("No servers to broadcast to.")
         else:
-            for name, base in st.session_state.servers.items():
-                st.write(f"**{name}** → {base}")
-                # تخطّي السيرفرات غير الداعمة لهذا المسار/الميثود
-                if not supports(base, method, req_path):
-                    st.info("Skipped (unsupported endpoint on this server).")
+            targets = list(st.session_state.servers.items())
+            bc_json = body or None
+            # caps how many connections this broadcast opens at once (the shared pool may be larger)
+            bc_sem = threading.BoundedSemaphore(max_conc)
+            bc_always_ok = (method, "/" + req_path.strip("/")) in _ALWAYS_OK
+
+            def _broadcast_one(base: str) -> requests.Response:
+                with bc_sem:
+                    return send_request(method, base, req_path, json_body=bc_json)
+
+            # OpenAPI docs for every server in parallel (plain fetch, ETag-revalidated); matching runs here
+            bc_docs = {} if bc_always_ok else _map_servers(fetch_openapi, (b.rstrip("/") for _, b in targets))
+
+            # all servers in flight at once; one summary table instead of a widget group per server
+            # servers saved under several names share one request; every alias gets its own row
+            by_base: Dict[str, Future] = {}
+            for _, base in targets:
+                key = base.rstrip("/")
+                if key in by_base:
                     continue
+                if bc_always_ok or _caps_support(build_caps(bc_docs.get(key)), method, req_path):
+                    by_base[key] = _REQ_POOL.submit(_broadcast_one, base)
+                else:
+                    # تخطّي السيرفرات غير الداعمة لهذا المسار/الميثود
+                    by_base[key] = Future()
+                    by_base[key].set_result(None)
+            futures = [(name, base, by_base[base.rstrip("/")]) for name, base in targets]
+
+            # live progress while replies arrive; the table below is built once everything is in
+            names_by_fut: Dict[Future, List[str]] = {}
+            for name, _, fut in futures:
+                names_by_fut.setdefault(fut, []).append(name)
+            total = len(names_by_fut)
+            with st.status(f"Broadcasting to {total} server(s)...", expanded=False) as bc_status:
+                for done, fut in enumerate(as_completed(names_by_fut), 1):
+                    bc_status.update(label=f"{done}/{total} done (latest: {', '.join(names_by_fut[fut])})")
+                bc_status.update(label=f"Broadcast finished ({total} server(s))", state="complete")
+
+            rows: List[Dict[str, Any]] = []
+            bodies: List[tuple[str, requests.Response]] = []
+            for name, base, fut in futures:
+                row: Dict[str, Any] = {"server": name, "url": base, "status": None, "ok": False, "body": ""}
                 try:
-                    resp = api_request(method, req_path, json_body=(body or None), base_url=base)
-                    st.code(f"Status: {resp.status_code}")
-                    try:
-                        st.json(resp.json())
-                    except Exception:
-                        st.text(resp.text)
+                    resp = fut.result()
+                    if resp is None:
+                        row["body"] = "Skipped (unsupported endpoint on this server)."
+                    else:
+                        st.session_state.last_response = resp
+                        row.update(status=resp.status_code, ok=resp.ok, body=resp.text[:200])
+                        bodies.append((name, resp))
                 except Exception as e:
-                    st.error(f"Failed: {e}")
+                    row["body"] = f"Failed: {e}"
+                rows.append(row)
+            st.dataframe(rows, use_container_width=True, hide_index=True)
+            for name, resp in bodies:
+                with st.expander(f"{name} — full response"):
+                    # st.json takes the JSON text as-is; no parse/re-serialise round trip
+                    if "application/json" in resp.headers.get("content-type", ""):
+                        st.json(resp.text)
+                    else:
+                        st.text(resp.text)